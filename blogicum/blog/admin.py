@@ -2,13 +2,14 @@
 
 from django.contrib import admin
 
-from .models import Category, Comment, Location, Post
+from .models import Category, Comment, ImageJob, Location, Post
 
 
 class PostAdmin(admin.ModelAdmin):
     title = ['title', 'pub_date', 'text', 'location', 'author', 'category']
     list_filter = ['pub_date']
-    list_display = ['title', 'author', 'location']
+    list_display = ['title', 'author', 'location', 'comment_count']
+    readonly_fields = ['comment_count', 'image_status']
     editable_list = ['category']
 
 
@@ -19,7 +20,13 @@ class CategoryAdmin(admin.ModelAdmin):
     editable_list = ['slug']
 
 
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ['image_name', 'post', 'status', 'attempts', 'updated_at']
+    list_filter = ['status']
+
+
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Post, PostAdmin)
 admin.site.register(Location)
 admin.site.register(Comment)
+admin.site.register(ImageJob, ImageJobAdmin)
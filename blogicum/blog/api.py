@@ -0,0 +1,121 @@
+"""JSON API лент публикаций для мобильного клиента."""
+
+import json
+from hashlib import md5
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag, urlencode
+
+from blog.caching import cache_anonymous_page
+from blog.models import Post
+from blog.views import get_category_feed, get_profile_feed
+from blogicum.constants import COUNT_POSTS
+from blogicum.utils import CursorPaginator
+
+FIELDS = {
+    'id': lambda post: post.id,
+    'title': lambda post: post.title,
+    'text': lambda post: post.text,
+    'pub_date': lambda post: post.pub_date,
+    'updated_at': lambda post: post.updated_at,
+    'author': lambda post: post.author.username,
+    'category': lambda post: post.category.slug if post.category else None,
+    'location': lambda post: (
+        post.location.name
+        if post.location and post.location.is_published else None
+    ),
+    'image': lambda post: post.image.url if post.image else None,
+    'comment_count': lambda post: post.comment_count,
+}
+
+
+def requested_fields(request):
+    """Поля из ?fields=, по умолчанию все; ValueError для неизвестных."""
+    value = request.GET.get('fields')
+    if not value:
+        return list(FIELDS)
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in FIELDS]
+    if unknown or not fields:
+        raise ValueError(', '.join(unknown))
+    return fields
+
+
+def page_link(request, fields, **cursor):
+    """Ссылка на соседнюю страницу с теми же полями."""
+    params = dict(cursor)
+    if request.GET.get('fields'):
+        params['fields'] = ','.join(fields)
+    return f'{request.path}?{urlencode(params)}'
+
+
+def feed_response(request, posts):
+    """Страница ленты в JSON с ETag, Last-Modified и ответом 304.
+
+    Last-Modified — самое позднее из времени публикации и правки
+    постов страницы, ETag — хэш самого ответа.
+    """
+    try:
+        fields = requested_fields(request)
+    except ValueError as error:
+        return JsonResponse(
+            {'error': f'Неизвестные поля: {error}'}, status=400
+        )
+    page = CursorPaginator(posts, COUNT_POSTS).get_page(
+        request.GET.get('after'),
+        request.GET.get('before')
+    )
+    content = json.dumps(
+        {
+            'results': [
+                {name: FIELDS[name](post) for name in fields}
+                for post in page
+            ],
+            'next': page.next_cursor and page_link(
+                request, fields, after=page.next_cursor
+            ),
+            'previous': page.previous_cursor and page_link(
+                request, fields, before=page.previous_cursor
+            ),
+        },
+        cls=DjangoJSONEncoder,
+        ensure_ascii=False
+    ).encode()
+    etag = quote_etag(md5(content).hexdigest())
+    last_modified = max(
+        (
+            max(post.pub_date, post.updated_at).timestamp()
+            for post in page
+        ),
+        default=None
+    )
+    response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified and int(last_modified),
+        response=response
+    )
+
+
+@cache_anonymous_page('feed')
+def index(request):
+    """Лента главной страницы."""
+    return feed_response(request, Post.published_posts.for_feed())
+
+
+@cache_anonymous_page('category:{category_slug}')
+def category_posts(request, category_slug):
+    """Лента категории."""
+    return feed_response(request, get_category_feed(category_slug)[1])
+
+
+@cache_anonymous_page('author:{username}')
+def profile(request, username):
+    """Лента автора; свои неопубликованные посты автор тоже видит."""
+    return feed_response(request, get_profile_feed(request, username)[1])
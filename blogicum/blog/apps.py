@@ -8,3 +8,7 @@ class BlogConfig(AppConfig):
     name = 'blog'
     verbose_name = 'Блог'
     verbose_name_plural = 'Блоги'
+
+    def ready(self):
+        """Подключает обработчики сигналов."""
+        from blog import signals  # noqa: F401
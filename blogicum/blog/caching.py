@@ -0,0 +1,190 @@
+"""Кэширование отрисованных фрагментов и страниц."""
+
+from functools import wraps
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import get_template
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from django.utils.safestring import mark_safe
+
+from blog.publication import timeout_until_boundary
+from core.routers import primary
+
+POST_CARD_GENERATION_KEY = 'post_card:generation'
+PAGE_GENERATION_KEY = 'page:generation:{}'
+# Сдвигается только записью постов и категорий, но не комментариями.
+COUNT_GENERATION_KEY = 'count:generation'
+PAGE_CACHE_PARAMS = ('page', 'after', 'before', 'fields', 'format')
+# Заголовки, которые сохраняются вместе с закэшированной страницей.
+PAGE_CACHE_HEADERS = ('ETag', 'Last-Modified')
+
+
+def get_generation(key):
+    """Возвращает текущее поколение кэша, создавая его при отсутствии."""
+    return cache.get_or_set(key, 1, None)
+
+
+def bump_generation(key):
+    """Сдвигает поколение, делая недоступными все ключи на его основе."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+
+def post_card_key(post, generation):
+    """Ключ карточки поста.
+
+    В ключ входят все поля, от которых зависит разметка карточки,
+    поэтому правка поста или его счётчика комментариев сама даёт
+    новый ключ. Изменения категорий и местоположений сдвигают общее
+    поколение. Карточка не содержит разметки, зависящей от зрителя.
+    """
+    category = post.category
+    location = post.location
+    state = (
+        post.updated_at.timestamp(),
+        post.comment_count,
+        post.is_published,
+        category.is_published if category else None,
+        location.is_published if location else None,
+        post.author.username,
+        generation,
+    )
+    digest = md5(repr(state).encode()).hexdigest()
+    return f'post_card:{post.id}:{digest}'
+
+
+def render_post_cards(posts):
+    """Отрисовывает карточки, беря готовые фрагменты из кэша."""
+    posts = list(posts)
+    generation = get_generation(POST_CARD_GENERATION_KEY)
+    keys = [post_card_key(post, generation) for post in posts]
+    cached = cache.get_many(keys)
+    missing = {}
+    template = None
+    for key, post in zip(keys, posts):
+        if key in cached:
+            continue
+        if template is None:
+            template = get_template('includes/post_card.html')
+        cached[key] = missing[key] = template.render({'post': post})
+    if missing:
+        cache.set_many(missing, settings.POST_CARD_CACHE_TIMEOUT)
+    return mark_safe(''.join(
+        f'<article class="mb-5">{cached[key]}</article>' for key in keys
+    ))
+
+
+def invalidate_pages(*scopes):
+    """Сбрасывает кэш страниц указанных областей.
+
+    Области: 'feed' — главная, 'category:<slug>', 'post:<id>',
+    'author:<username>', 'all' — все закэшированные страницы.
+    """
+    for scope in scopes:
+        bump_generation(PAGE_GENERATION_KEY.format(scope))
+
+
+def feed_count_options(scope, variant=''):
+    """Параметры кэша числа постов ленты для get_paginator.
+
+    Ключ включает поколение COUNT_GENERATION_KEY, поэтому запись поста
+    или категории сразу делает закэшированное число устаревшим, а
+    комментарии его не трогают. variant различает выборки внутри
+    одной области, например поисковые запросы.
+    """
+    if variant:
+        variant = ':' + md5(variant.encode()).hexdigest()
+    generation = cache.get(COUNT_GENERATION_KEY, 1)
+    return {
+        'count_key': f'count:{scope}:{generation}{variant}',
+        'count_timeout': timeout_until_boundary(
+            settings.FEED_COUNT_TIMEOUT
+        ),
+    }
+
+
+def page_cache_timeout():
+    """Время жизни страницы: не дольше, чем до ближайшей публикации."""
+    return timeout_until_boundary(settings.PAGE_CACHE_TIMEOUT)
+
+
+def page_cache_key(request, scopes):
+    """Ключ страницы: путь, параметры пагинации и поколения областей."""
+    generation_keys = [PAGE_GENERATION_KEY.format(scope) for scope in scopes]
+    generations = cache.get_many(generation_keys)
+    state = (
+        request.path,
+        [(name, request.GET.get(name)) for name in PAGE_CACHE_PARAMS],
+        [generations.get(key, 1) for key in generation_keys],
+    )
+    return 'page:' + md5(repr(state).encode()).hexdigest()
+
+
+def conditional_response(request, response):
+    """304 вместо response, если ETag или Last-Modified не изменились."""
+    return get_conditional_response(
+        request,
+        etag=response.get('ETag'),
+        last_modified=parse_http_date_safe(
+            response.get('Last-Modified', '')
+        ),
+        response=response
+    )
+
+
+def cache_anonymous_page(*scopes):
+    """Кэширует страницу для анонимных пользователей.
+
+    Области могут ссылаться на аргументы view, например
+    'post:{post_id}'. Поколение 'all' учитывается всегда. ETag и
+    Last-Modified сохраняются вместе со страницей, и на условный
+    запрос отвечается 304. Страница для кэша строится по основной
+    базе, а не по реплике.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+            key = page_cache_key(
+                request,
+                ['all'] + [scope.format(**kwargs) for scope in scopes]
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type, headers = cached
+                response = HttpResponse(content, content_type=content_type)
+                for header, value in headers.items():
+                    response[header] = value
+                return conditional_response(request, response)
+            with primary():
+                response = view(request, *args, **kwargs)
+            if (
+                response.status_code == 200
+                and not response.streaming
+                and not response.cookies
+            ):
+                timeout = page_cache_timeout()
+                if timeout > 0:
+                    headers = {
+                        header: response[header]
+                        for header in PAGE_CACHE_HEADERS
+                        if response.has_header(header)
+                    }
+                    cache.set(
+                        key,
+                        (response.content, response['Content-Type'], headers),
+                        timeout
+                    )
+            return conditional_response(request, response)
+        return wrapper
+    return decorator
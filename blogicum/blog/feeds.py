@@ -0,0 +1,116 @@
+"""RSS- и Atom-ленты публикаций."""
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from blog.models import Post
+from blog.views import get_category_feed
+from blogicum.constants import COUNT_FEED_ITEMS
+
+
+User = get_user_model()
+
+
+class PostFeed(Feed):
+    """Общая часть лент: элементы — опубликованные посты."""
+
+    title = 'Блогикум'
+    description = 'Новые публикации Блогикума'
+
+    def link(self):
+        return reverse('blog:index')
+
+    def items(self, obj):
+        return self.posts(obj)[:COUNT_FEED_ITEMS]
+
+    def posts(self, obj):
+        return Post.published_posts.for_feed()
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', args=(item.id,))
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return max(item.pub_date, item.updated_at)
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_categories(self, item):
+        return (item.category.title,)
+
+
+class LatestPostsFeed(PostFeed):
+    """RSS общей ленты."""
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    """Atom общей ленты."""
+
+    feed_type = Atom1Feed
+    subtitle = PostFeed.description
+
+
+class CategoryFeed(PostFeed):
+    """RSS ленты категории."""
+
+    def get_object(self, request, category_slug):
+        return get_category_feed(category_slug)[0]
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=(obj.slug,))
+
+    def posts(self, obj):
+        return obj.posts(manager='published_posts').for_feed()
+
+
+class CategoryAtomFeed(CategoryFeed):
+    """Atom ленты категории."""
+
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return obj.description
+
+
+class AuthorFeed(PostFeed):
+    """RSS опубликованных постов автора."""
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj):
+        return f'Блогикум: @{obj.username}'
+
+    def description(self, obj):
+        return f'Публикации автора @{obj.username}'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=(obj.username,))
+
+    def posts(self, obj):
+        return Post.published_posts.for_feed().filter(author=obj)
+
+
+class AuthorAtomFeed(AuthorFeed):
+    """Atom постов автора."""
+
+    feed_type = Atom1Feed
+    subtitle = AuthorFeed.description
@@ -0,0 +1,103 @@
+"""Уменьшенные копии изображений публикаций."""
+
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+RENDITION_FORMATS = {
+    'webp': 'WEBP',
+    'jpeg': 'JPEG',
+}
+
+
+def rendition_name(name, width, extension):
+    """Имя копии рядом с оригиналом: dir/renditions/<имя>_<ширина>.<ext>."""
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, 'renditions', f'{stem}_{width}.{extension}'
+    )
+
+
+def rendition_srcset(name, widths, extension):
+    """Значение атрибута srcset для готовых копий."""
+    return ', '.join(
+        f'{default_storage.url(rendition_name(name, width, extension))} '
+        f'{width}w'
+        for width in widths
+    )
+
+
+def delete_image_files(name, storage=default_storage):
+    """Удаляет оригинал и все его уменьшенные копии."""
+    storage.delete(name)
+    directory = posixpath.join(posixpath.dirname(name), 'renditions')
+    prefix = posixpath.splitext(posixpath.basename(name))[0] + '_'
+    if not storage.exists(directory):
+        return
+    for filename in storage.listdir(directory)[1]:
+        if filename.startswith(prefix):
+            storage.delete(posixpath.join(directory, filename))
+
+
+def load_image(name, storage=default_storage):
+    """Открывает и полностью декодирует изображение из хранилища."""
+    with storage.open(name) as original:
+        image = Image.open(original)
+        image.load()
+    return image
+
+
+def strip_metadata(name, image, field):
+    """Убирает EXIF из оригинала, применив поворот из него.
+
+    Если метаданных нет, файл не трогается. Иначе очищенная копия
+    сохраняется в хранилище поля field так же, как новая загрузка, —
+    в каталог upload_to, а не рядом с оригиналом; возвращается
+    (имя, изображение).
+    """
+    if not image.getexif() and 'exif' not in image.info:
+        return name, image
+    image_format = image.format
+    image = ImageOps.exif_transpose(image)
+    buffer = BytesIO()
+    image.save(buffer, image_format)
+    return field.storage.save(
+        field.generate_filename(None, posixpath.basename(name)),
+        ContentFile(buffer.getvalue())
+    ), image
+
+
+def save_renditions(name, image, storage=default_storage):
+    """Сохраняет копии изображения всех ширин и форматов.
+
+    Копии шире оригинала не создаются. Возвращает список ширин.
+    """
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    widths = [
+        width for width in settings.IMAGE_RENDITION_WIDTHS
+        if width <= image.width
+    ] or [image.width]
+    for width in widths:
+        resized = image.resize(
+            (width, max(round(image.height * width / image.width), 1)),
+            Image.Resampling.LANCZOS
+        )
+        for extension, image_format in RENDITION_FORMATS.items():
+            target = rendition_name(name, width, extension)
+            buffer = BytesIO()
+            resized.save(buffer, image_format, quality=82)
+            if storage.exists(target):
+                storage.delete(target)
+            storage.save(target, ContentFile(buffer.getvalue()))
+    return widths
+
+
+def generate_renditions(name, storage=default_storage):
+    """Создаёт копии для уже сохранённого изображения."""
+    return save_renditions(name, load_image(name, storage), storage)
@@ -0,0 +1,163 @@
+"""Очередь фоновой обработки изображений."""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from blog.images import load_image, save_renditions, strip_metadata
+from blog.models import (IMAGE_FAILED, IMAGE_READY, JOB_DONE, JOB_FAILED,
+                         JOB_PENDING, JOB_PROCESSING, ImageJob, Post)
+
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_JOB_WORKERS,
+    thread_name_prefix='image-jobs'
+)
+
+
+def enqueue_image_job(post):
+    """Ставит изображение поста в очередь.
+
+    При IMAGE_JOBS_INLINE очередь сразу разбирается пулом потоков
+    после фиксации транзакции; иначе её разбирает команда
+    process_image_jobs.
+    """
+    ImageJob.objects.create(post=post, image_name=post.image.name)
+    if settings.IMAGE_JOBS_INLINE:
+        transaction.on_commit(schedule_pending_jobs)
+
+
+def schedule_pending_jobs(delay=0):
+    """Разбирает очередь пулом потоков сайта через delay секунд.
+
+    Отложенный запуск живёт только в памяти процесса: после
+    перезапуска сайта оставшиеся задания подхватит следующая загрузка
+    или команда process_image_jobs.
+    """
+    if not delay:
+        executor.submit(run_pending_jobs)
+        return
+    timer = threading.Timer(delay, executor.submit, [run_pending_jobs])
+    timer.daemon = True
+    timer.start()
+
+
+def requeue_stale_jobs(seconds=None):
+    """Возвращает в очередь задания, зависшие в обработке дольше seconds.
+
+    Такие задания остаются после падения обработчика. По умолчанию
+    seconds — IMAGE_JOB_STALE_AFTER. Возвращает число заданий.
+    """
+    if seconds is None:
+        seconds = settings.IMAGE_JOB_STALE_AFTER
+    return ImageJob.objects.filter(
+        status=JOB_PROCESSING,
+        updated_at__lt=timezone.now() - timedelta(seconds=seconds)
+    ).update(status=JOB_PENDING)
+
+
+def claim_job():
+    """Забирает из очереди следующее задание; None, если очередь пуста.
+
+    Задания, отложенные после неудачной попытки, ждут своего run_after.
+    """
+    while True:
+        job = ImageJob.objects.filter(
+            status=JOB_PENDING,
+            run_after__lte=timezone.now()
+        ).first()
+        if job is None:
+            return None
+        claimed = ImageJob.objects.filter(
+            pk=job.pk,
+            status=JOB_PENDING
+        ).update(
+            status=JOB_PROCESSING,
+            attempts=F('attempts') + 1,
+            updated_at=timezone.now()
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def run_job(job):
+    """Очищает изображение от EXIF, создаёт копии и отмечает пост."""
+    from blog.signals import invalidate_post_pages, release_image
+
+    field = Post._meta.get_field('image')
+    storage = field.storage
+    try:
+        image = load_image(job.image_name, storage)
+        name, image = strip_metadata(job.image_name, image, field)
+        widths = save_renditions(name, image, storage)
+    except Exception as error:
+        logger.exception('Не удалось обработать %s', job.image_name)
+        final = job.attempts >= settings.IMAGE_JOB_MAX_ATTEMPTS
+        delay = settings.IMAGE_JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+        ImageJob.objects.filter(pk=job.pk).update(
+            status=JOB_FAILED if final else JOB_PENDING,
+            error=str(error),
+            run_after=timezone.now() + timedelta(seconds=delay)
+        )
+        if not final and settings.IMAGE_JOBS_INLINE:
+            schedule_pending_jobs(delay)
+        if final:
+            Post.objects.filter(pk=job.post_id, image=job.image_name).update(
+                image_status=IMAGE_FAILED,
+                updated_at=timezone.now()
+            )
+        return
+    with transaction.atomic():
+        if not storage.exists(name):
+            # Такой же файл другого поста удалили, пока шла обработка:
+            # release_image проверяет ссылки в такой же транзакции.
+            name, image = strip_metadata(job.image_name, image, field)
+            widths = save_renditions(name, image, storage)
+        updated = Post.objects.filter(
+            pk=job.post_id, image=job.image_name
+        ).update(
+            image=name,
+            image_status=IMAGE_READY,
+            image_renditions=','.join(map(str, widths)),
+            updated_at=timezone.now()
+        )
+    if name != job.image_name:
+        release_image(job.image_name if updated else name)
+    ImageJob.objects.filter(pk=job.pk).update(status=JOB_DONE, error='')
+    post = Post.objects.filter(pk=job.post_id).values(
+        'author_id', 'category_id'
+    ).first()
+    if post:
+        invalidate_post_pages(
+            job.post_id, post['author_id'], post['category_id']
+        )
+
+
+def run_pending_jobs(limit=None, stale_after=None):
+    """Выполняет задания, пока очередь не опустеет или не выйдет limit.
+
+    Сначала возвращает в очередь задания, зависшие в обработке дольше
+    stale_after секунд: их бросил упавший обработчик.
+    """
+    close_old_connections()
+    done = 0
+    try:
+        requeue_stale_jobs(stale_after)
+        while limit is None or done < limit:
+            job = claim_job()
+            if job is None:
+                break
+            run_job(job)
+            done += 1
+    finally:
+        close_old_connections()
+    return done
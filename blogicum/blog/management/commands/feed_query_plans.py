@@ -0,0 +1,110 @@
+"""Планы и время запросов ленты с индексами и без них."""
+
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from blog.models import Category, Comment, Post
+
+
+User = get_user_model()
+
+SEED_BATCH = 10000
+
+
+class Command(BaseCommand):
+    help = (
+        'Печатает EXPLAIN и время запросов ленты до и после индексов '
+        'из Meta.indexes; с --seed предварительно заполняет базу '
+        'на время замера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Сколько публикаций добавить на время замера.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Сколько раз выполнять каждый запрос.'
+        )
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        # Всё, включая данные из --seed, откатывается после замера.
+        with transaction.atomic():
+            if options['seed']:
+                self.seed(options['seed'])
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for model in (Post, Comment):
+                        for index in model._meta.indexes:
+                            cursor.execute(
+                                'DROP INDEX %s' % connection.ops.quote_name(
+                                    index.name
+                                )
+                            )
+                self.report('Без индексов')
+                transaction.set_rollback(True)
+            self.report('С индексами')
+            transaction.set_rollback(True)
+
+    def seed(self, total):
+        author, _ = User.objects.get_or_create(username='feed_bench')
+        categories = [
+            Category.objects.get_or_create(
+                slug=f'feed-bench-{number}',
+                defaults={'title': f'Категория {number}', 'description': ''}
+            )[0]
+            for number in range(20)
+        ]
+        start = timezone.now()
+        for offset in range(0, total, SEED_BATCH):
+            Post.objects.bulk_create(
+                Post(
+                    title=f'Публикация {number}',
+                    text='Текст публикации',
+                    pub_date=start - timedelta(minutes=number),
+                    author=author,
+                    category=categories[number % len(categories)],
+                    is_published=number % 7 != 0
+                )
+                for number in range(offset, min(offset + SEED_BATCH, total))
+            )
+        self.stdout.write(f'Добавлено публикаций: {total}')
+
+    def queries(self):
+        post = Post.objects.order_by('id').first()
+        category = Category.objects.order_by('id').first()
+        yield 'Лента, первая страница', Post.published_posts.select_related(
+            'author', 'location', 'category'
+        ).order_by('-pub_date', '-id')[:10]
+        if category:
+            yield 'Лента категории', Post.published_posts.filter(
+                category=category
+            ).order_by('-pub_date')[:10]
+        if post:
+            yield 'Профиль автора', Post.objects.filter(
+                author_id=post.author_id
+            ).order_by('-pub_date')[:10]
+            yield 'Комментарии публикации', Comment.objects.filter(
+                post_id=post.id
+            ).order_by('created_at')[:10]
+
+    def report(self, title):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        for name, queryset in self.queries():
+            started = time.perf_counter()
+            for _ in range(self.repeat):
+                list(queryset.all())
+            elapsed = (time.perf_counter() - started) / self.repeat
+            self.stdout.write(f'{name}: {elapsed * 1000:.2f} мс')
+            self.stdout.write(queryset.explain())
@@ -0,0 +1,62 @@
+"""Обработчик очереди изображений."""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.jobs import requeue_stale_jobs, run_pending_jobs
+from blog.models import IMAGE_PENDING, IMAGE_UNPROCESSED, ImageJob, Post
+
+
+class Command(BaseCommand):
+    help = 'Разбирает очередь обработки изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Разобрать очередь и завершиться.'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2,
+            help='Пауза между проверками пустой очереди, секунд.'
+        )
+        parser.add_argument(
+            '--requeue-after',
+            type=int,
+            help='Вернуть в очередь задания, зависшие дольше N секунд; '
+                 'по умолчанию IMAGE_JOB_STALE_AFTER.'
+        )
+        parser.add_argument(
+            '--enqueue-missing',
+            action='store_true',
+            help='Поставить в очередь изображения, ещё не проходившие '
+                 'обработку.'
+        )
+
+    def handle(self, *args, **options):
+        if options['enqueue_missing']:
+            self.enqueue_missing()
+        requeued = requeue_stale_jobs(options['requeue_after'])
+        if requeued:
+            self.stdout.write(f'Возвращено в очередь: {requeued}')
+        while True:
+            done = run_pending_jobs(stale_after=options['requeue_after'])
+            if done:
+                self.stdout.write(f'Обработано изображений: {done}')
+            if options['once']:
+                return
+            time.sleep(options['sleep'])
+
+    def enqueue_missing(self):
+        posts = Post.objects.exclude(image='').filter(
+            image_status=IMAGE_UNPROCESSED
+        )
+        ImageJob.objects.bulk_create(
+            ImageJob(post_id=pk, image_name=name)
+            for pk, name in posts.values_list('pk', 'image').iterator()
+        )
+        queued = posts.update(image_status=IMAGE_PENDING)
+        self.stdout.write(f'Поставлено в очередь: {queued}')
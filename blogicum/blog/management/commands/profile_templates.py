@@ -0,0 +1,89 @@
+"""Профиль отрисовки шаблонов страницы сайта."""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+from core import template_profiler
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Запрашивает страницу несколько раз с профилированием шаблонов, '
+        'печатает время по шаблонам и тегам и сохраняет collapsed stacks '
+        'для flamegraph.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Адрес страницы, например /posts/1/.')
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=20,
+            help='Сколько раз запросить страницу.'
+        )
+        parser.add_argument(
+            '--user',
+            help='Запрашивать от имени этого пользователя.'
+        )
+        parser.add_argument(
+            '--clear-cache',
+            action='store_true',
+            help='Очищать кэш перед каждым запросом.'
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для collapsed stacks.'
+        )
+
+    def handle(self, *args, **options):
+        # Промежуточные слои клиент создаёт при первом запросе.
+        with override_settings(TEMPLATE_PROFILING=True):
+            client = Client(HTTP_HOST=next(
+                (
+                    host for host in settings.ALLOWED_HOSTS
+                    if host != '*' and not host.startswith('.')
+                ),
+                'localhost'
+            ))
+            if options['user']:
+                client.force_login(User.objects.get(username=options['user']))
+            # Первый запрос загружает и компилирует шаблоны.
+            response = client.get(options['path'])
+            self.stdout.write(f'Ответ: {response.status_code}')
+            template_profiler.reset()
+            for _ in range(options['requests']):
+                if options['clear_cache']:
+                    cache.clear()
+                client.get(options['path'])
+        profile = template_profiler.collected()
+        template_profiler.reset()
+        if not profile.stats:
+            self.stdout.write(
+                'Шаблоны не отрисовывались: страница отдана из кэша. '
+                'Запустите с --user или --clear-cache.'
+            )
+            return
+        count = options['requests']
+        self.stdout.write(
+            f'{"Шаблон или тег":<48} {"вызовов":>8} '
+            f'{"полное, мс":>11} {"своё, мс":>9}'
+        )
+        for name, (calls, cumulative, own) in sorted(
+            profile.stats.items(), key=lambda item: -item[1][2]
+        ):
+            self.stdout.write(
+                f'{name:<48} {calls / count:>8.1f} '
+                f'{cumulative / count * 1000:>11.2f} '
+                f'{own / count * 1000:>9.2f}'
+            )
+        self.stdout.write('Время — среднее на один запрос.')
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                output.write(profile.collapsed())
+            self.stdout.write(f'Стеки записаны в {options["output"]}')
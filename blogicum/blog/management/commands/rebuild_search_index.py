@@ -0,0 +1,194 @@
+"""Пересборка поискового индекса публикаций пачками."""
+
+import multiprocessing
+import time
+from queue import Empty
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import Max, Min
+
+from blog.models import Post
+from blog.search import FTS_TABLE, PROGRESS_TABLE, replace_rows
+
+# Сколько раз пробовать записать пачку, если база занята.
+WRITE_ATTEMPTS = 5
+
+
+def index_range(range_start, last_id, range_end, batch_size, progress):
+    """Индексирует посты с id в (last_id, range_end] пачками.
+
+    Каждая пачка записывается вместе с отметкой о прогрессе в одной
+    транзакции, поэтому после прерывания работа продолжается с
+    последней записанной пачки. Пачка дочитывается до начала записи:
+    открытый SELECT на время чужих коммитов делает снимок устаревшим,
+    и BEGIN IMMEDIATE сразу падает с SQLITE_BUSY. После каждой пачки
+    вызывает progress((range_start, range_end, last_id, строк, строк/с)).
+    Возвращает (строк, секунд).
+    """
+    connections.close_all()
+    started = time.perf_counter()
+    done = 0
+    posts = Post.objects.filter(
+        pk__lte=range_end
+    ).order_by('pk').values_list('pk', 'title', 'text')
+    while last_id < range_end:
+        batch = list(
+            posts.filter(pk__gt=last_id)[:batch_size].iterator(
+                chunk_size=batch_size
+            )
+        )
+        batch_end = batch[-1][0] if len(batch) == batch_size else range_end
+        last_id = write_batch(range_start, last_id, batch_end, batch)
+        done += len(batch)
+        progress((
+            range_start,
+            range_end,
+            last_id,
+            done,
+            done / (time.perf_counter() - started)
+        ))
+    connections.close_all()
+    return done, time.perf_counter() - started
+
+
+def write_batch(range_start, after_id, last_id, rows):
+    """Записывает пачку и прогресс диапазона; возвращает last_id.
+
+    Большие пачки нескольких процессов могут ждать друг друга дольше
+    busy_timeout; тогда запись повторяется, она идемпотентна.
+    """
+    for attempt in range(1, WRITE_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                replace_rows(after_id, last_id, rows)
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'UPDATE {PROGRESS_TABLE} SET last_id = %s '
+                        'WHERE range_start = %s',
+                        [last_id, range_start]
+                    )
+            return last_id
+        except OperationalError as error:
+            if 'locked' not in str(error) or attempt == WRITE_ATTEMPTS:
+                raise
+            time.sleep(attempt)
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересобирает поисковый индекс публикаций пачками по первичному '
+        'ключу; с --resume продолжает прерванную пересборку.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Сколько постов читать и записывать за одну транзакцию.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Число процессов; каждому достаётся свой диапазон id.'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить с места, где остановилась прошлая пересборка.'
+        )
+
+    def handle(self, *args, **options):
+        ranges = self.pending_ranges() if options['resume'] else (
+            self.plan_ranges(options['workers'])
+        )
+        if not ranges:
+            self.stdout.write('Пересобирать нечего.')
+            return
+        self.verbosity = options['verbosity']
+        arguments = [
+            (range_start, last_id, range_end, options['batch_size'])
+            for range_start, last_id, range_end in ranges
+        ]
+        started = time.perf_counter()
+        if options['workers'] > 1:
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with context.Manager() as manager, context.Pool(
+                min(options['workers'], len(ranges))
+            ) as pool:
+                queue = manager.Queue()
+                results = self.collect(
+                    pool.starmap_async(index_range, [
+                        item + (queue.put,) for item in arguments
+                    ]),
+                    queue
+                )
+        else:
+            results = [
+                index_range(*item, self.report) for item in arguments
+            ]
+        rows = sum(done for done, _ in results)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано постов: {rows} за {elapsed:.1f} с, '
+            f'{rows / elapsed if elapsed else 0:.0f} строк/с'
+        ))
+
+    def report(self, progress):
+        """Печатает прогресс диапазона, если verbosity не 0."""
+        if not self.verbosity:
+            return
+        range_start, range_end, last_id, done, rate = progress
+        self.stdout.write(
+            f'[{range_start}-{range_end}] до id {last_id}: '
+            f'{done} строк, {rate:.0f} строк/с'
+        )
+
+    def collect(self, result, queue):
+        """Печатает прогресс процессов, пока они работают; их результаты."""
+        while not result.ready():
+            try:
+                self.report(queue.get(timeout=0.2))
+            except Empty:
+                pass
+        while True:
+            try:
+                self.report(queue.get_nowait())
+            except Empty:
+                return result.get()
+
+    def plan_ranges(self, workers):
+        """Делит id постов на диапазоны и сбрасывает прогресс."""
+        bounds = Post.objects.aggregate(low=Min('pk'), high=Max('pk'))
+        low, high = bounds['low'] or 1, bounds['high'] or 0
+        step = max((high - low + 1 + workers - 1) // workers, 1)
+        ranges = [
+            (start, start - 1, min(start + step - 1, high))
+            for start in range(low, high + 1, step)
+        ]
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Строки постов за пределами диапазонов уже не нужны.
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid < %s OR rowid > %s',
+                [low, high]
+            )
+            cursor.execute(f'DELETE FROM {PROGRESS_TABLE}')
+            cursor.executemany(
+                f'INSERT INTO {PROGRESS_TABLE} '
+                '(range_start, last_id, range_end) VALUES (%s, %s, %s)',
+                ranges
+            )
+        return ranges
+
+    def pending_ranges(self):
+        """Незавершённые диапазоны прошлой пересборки."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT range_start, last_id, range_end '
+                f'FROM {PROGRESS_TABLE} WHERE last_id < range_end '
+                'ORDER BY range_start'
+            )
+            return cursor.fetchall()
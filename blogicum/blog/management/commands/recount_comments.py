@@ -0,0 +1,37 @@
+"""Пересчёт денормализованного счётчика комментариев."""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает Post.comment_count для разошедшихся счётчиков.'
+
+    def handle(self, *args, **options):
+        actual = Coalesce(
+            Subquery(
+                Comment.objects.filter(
+                    post=OuterRef('pk')
+                ).order_by().values('post').annotate(
+                    total=Count('pk')
+                ).values('total'),
+                output_field=IntegerField()
+            ),
+            0
+        )
+        drifted = Post.objects.annotate(
+            actual=actual
+        ).exclude(
+            comment_count=F('actual')
+        ).values('pk')
+        updated = Post.objects.filter(
+            pk__in=drifted
+        ).update(
+            comment_count=actual
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {updated}')
+        )
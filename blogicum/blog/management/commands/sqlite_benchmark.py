@@ -0,0 +1,132 @@
+"""Пропускная способность SQLite при работе из нескольких процессов."""
+
+import multiprocessing
+import random
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections, transaction
+from django.utils import timezone
+
+from blog.models import Category, Comment, Post
+
+
+User = get_user_model()
+
+
+def work(seconds, write_ratio, post_id, author_id):
+    """Чередует чтение ленты и добавление комментариев до дедлайна."""
+    connections.close_all()
+    generator = random.Random()
+    reads = writes = locked = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            if generator.random() < write_ratio:
+                # Типичная пишущая транзакция: сначала чтение, потом запись.
+                with transaction.atomic():
+                    Comment.objects.create(
+                        text='Комментарий нагрузочного теста',
+                        post=Post.objects.get(pk=post_id),
+                        author_id=author_id
+                    )
+                writes += 1
+            else:
+                list(Post.published_posts.for_feed()[:10])
+                reads += 1
+        except OperationalError:
+            locked += 1
+    connections.close_all()
+    return reads, writes, locked
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает несколько процессов, которые читают ленту и пишут '
+        'комментарии, и печатает число операций в секунду.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=4,
+            help='Число процессов.'
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=5,
+            help='Длительность замера.'
+        )
+        parser.add_argument(
+            '--write-ratio',
+            type=float,
+            default=0.2,
+            help='Доля операций записи.'
+        )
+        parser.add_argument(
+            '--defaults',
+            action='store_true',
+            help='Замерить без SQLITE_PRAGMAS: журнал DELETE, BEGIN DEFERRED.'
+        )
+
+    def handle(self, *args, **options):
+        if options['defaults']:
+            settings.SQLITE_PRAGMAS = {'journal_mode': 'DELETE'}
+            settings.SQLITE_TRANSACTION_MODE = None
+        connections.close_all()
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+        author, category, post = self.fixture()
+        try:
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with context.Pool(options['processes']) as pool:
+                results = pool.starmap(work, [(
+                    options['seconds'],
+                    options['write_ratio'],
+                    post.id,
+                    author.id
+                )] * options['processes'])
+        finally:
+            # Вместе с автором удаляются его публикация и комментарии.
+            author.delete()
+            category.delete()
+        reads, writes, locked = map(sum, zip(*results))
+        seconds = options['seconds']
+        self.stdout.write(
+            f'journal_mode={journal_mode}, '
+            f'процессов: {options["processes"]}'
+        )
+        self.stdout.write(f'Чтений в секунду: {reads / seconds:.0f}')
+        self.stdout.write(f'Записей в секунду: {writes / seconds:.0f}')
+        self.stdout.write(f'Ошибок «database is locked»: {locked}')
+
+    def fixture(self):
+        """Автор, категория и публикация, к которой пишутся комментарии.
+
+        Процессы пишут через свои соединения, поэтому данные нельзя
+        держать в откатываемой транзакции: handle удаляет их сам.
+        """
+        # Остатки прежних запусков тоже удаляются после замера.
+        author, _ = User.objects.get_or_create(username='sqlite_bench')
+        category, _ = Category.objects.update_or_create(
+            slug='sqlite-bench',
+            defaults={
+                'title': 'Нагрузочный тест',
+                'description': '',
+                'is_published': False
+            }
+        )
+        post = Post.objects.create(
+            title='Публикация нагрузочного теста',
+            text='Текст',
+            pub_date=timezone.now(),
+            author=author,
+            category=category
+        )
+        return author, category, post
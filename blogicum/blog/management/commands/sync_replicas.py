@@ -0,0 +1,49 @@
+"""Копирование основной SQLite-базы в реплики вместо репликации."""
+
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует базу default в каждую базу из DATABASE_REPLICAS '
+        'через SQLite backup API; с --interval повторяет копирование.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Пауза между копированиями; 0 — скопировать один раз.'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('В DATABASE_REPLICAS нет реплик.')
+        while True:
+            self.sync()
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def sync(self):
+        primary = connections['default']
+        primary.ensure_connection()
+        for alias in settings.DATABASE_REPLICAS:
+            replica = connections[alias]
+            # Соединение реплики в этом процессе не должно держать
+            # старую схему в кэше после перезаписи файла.
+            replica.close()
+            started = time.perf_counter()
+            target = sqlite3.connect(str(replica.settings_dict['NAME']))
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stdout.write(f'{alias}: скопировано за {elapsed:.0f} мс')
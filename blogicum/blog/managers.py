@@ -4,12 +4,28 @@ from django.db import models
 from django.utils import timezone
 
 
-class PostManager(models.Manager):
-    def get_queryset(self):
-        return super().get_queryset().filter(
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        """Посты, видимые всем: опубликованные и не отложенные."""
+        return self.filter(
             is_published=True,
             category__is_published=True,
             pub_date__lte=timezone.now()
+        )
+
+    def for_feed(self):
+        """Посты для ленты со всем, что нужно карточке, за один запрос."""
+        return self.select_related(
+            'author',
+            'location',
+            'category'
         ).order_by(
             '-pub_date'
         )
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().published().order_by(
+            '-pub_date'
+        )
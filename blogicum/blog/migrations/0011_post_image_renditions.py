@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_renditions',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Ширины уменьшенных копий'),
+        ),
+    ]
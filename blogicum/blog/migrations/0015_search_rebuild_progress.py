@@ -0,0 +1,22 @@
+# Generated by Django 3.2.16 on 2026-10-18 10:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_post_search_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE TABLE blog_post_fts_progress ('
+                'range_start integer NOT NULL PRIMARY KEY, '
+                'range_end integer NOT NULL, '
+                'last_id integer NOT NULL)'
+            ),
+            reverse_sql='DROP TABLE blog_post_fts_progress',
+        ),
+    ]
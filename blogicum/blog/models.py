@@ -2,14 +2,39 @@
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
-from blog.managers import PostManager
+from blog.images import RENDITION_FORMATS, rendition_srcset
+from blog.managers import PostManager, PostQuerySet
+from blog.storage import image_storage
 from blogicum.constants import CHARACTER_RESTRICTION, MAX_NAME_LENG
 
 
 User = get_user_model()
 
+IMAGE_UNPROCESSED = 0
+IMAGE_PENDING = 1
+IMAGE_READY = 2
+IMAGE_FAILED = 3
+IMAGE_STATUSES = (
+    (IMAGE_UNPROCESSED, 'Не обрабатывалось'),
+    (IMAGE_PENDING, 'В обработке'),
+    (IMAGE_READY, 'Готово'),
+    (IMAGE_FAILED, 'Ошибка'),
+)
+
+JOB_PENDING = 'pending'
+JOB_PROCESSING = 'processing'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_STATUSES = (
+    (JOB_PENDING, 'В очереди'),
+    (JOB_PROCESSING, 'Выполняется'),
+    (JOB_DONE, 'Выполнено'),
+    (JOB_FAILED, 'Ошибка'),
+)
+
 
 class BaseModel(models.Model):
     """Базовая модель, от которой наследуются другие."""
@@ -105,10 +130,32 @@ class Post(BaseModel):
     image = models.ImageField(
         'Фото',
         upload_to='blogicum_images',
+        storage=image_storage,
         blank=True
     )
+    image_status = models.PositiveSmallIntegerField(
+        choices=IMAGE_STATUSES,
+        default=IMAGE_UNPROCESSED,
+        editable=False,
+        verbose_name='Обработка изображения'
+    )
+    image_renditions = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        verbose_name='Ширины уменьшенных копий'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
 
-    objects = models.Manager()
+    objects = PostQuerySet.as_manager()
     published_posts = PostManager()
 
     class Meta(BaseModel.Meta):
@@ -117,11 +164,63 @@ class Post(BaseModel):
         verbose_name = 'Публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('pub_date', 'id'),
+                name='post_published_pub_date_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=('category', 'pub_date'),
+                name='post_category_pub_date_idx'
+            ),
+            models.Index(
+                fields=('image',),
+                name='post_image_idx'
+            ),
+        )
 
     def __str__(self):
         """Магический метод дял админки."""
         return self.title[:CHARACTER_RESTRICTION]
 
+    def save(self, *args, **kwargs):
+        # Файл изображения сохраняется в одной транзакции со строкой
+        # поста, чтобы release_image не удалил его между ними.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает имя изображения, с которым пост прочитан из базы.
+
+        По нему remember_post_state отличает замену изображения от
+        сохранения экземпляра, прочитанного до окончания обработки.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_image = instance.__dict__.get('image')
+        return instance
+
+    @property
+    def image_pending(self):
+        """Изображение ещё обрабатывается — в ленте нужна заглушка."""
+        return self.image_status == IMAGE_PENDING
+
+    @property
+    def image_srcset(self):
+        """Значения srcset готовых копий изображения по форматам."""
+        if not self.image or not self.image_renditions:
+            return {}
+        widths = self.image_renditions.split(',')
+        return {
+            extension: rendition_srcset(self.image.name, widths, extension)
+            for extension in RENDITION_FORMATS
+        }
+
 
 class Comment(models.Model):
     text = models.TextField('Написать комментарий')
@@ -146,7 +245,68 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx'
+            ),
+        )
 
     def __str__(self):
         """Магический метод дял админки."""
         return self.title[:CHARACTER_RESTRICTION]
+
+
+class ImageJob(models.Model):
+    """Задание фоновой обработки изображения публикации."""
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='Публикация',
+        related_name='image_jobs'
+    )
+    image_name = models.CharField(
+        max_length=MAX_NAME_LENG,
+        verbose_name='Файл'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=JOB_STATUSES,
+        default=JOB_PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попытки'
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Не раньше'
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name='Ошибка'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
+
+    class Meta:
+        verbose_name = 'обработка изображения'
+        verbose_name_plural = 'Обработка изображений'
+        ordering = ('id',)
+        indexes = (
+            models.Index(
+                fields=('status', 'id'),
+                name='imagejob_status_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.image_name} ({self.get_status_display()})'
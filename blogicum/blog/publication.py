@@ -0,0 +1,62 @@
+"""Граница ближайшей отложенной публикации."""
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.routers import primary
+
+BOUNDARY_KEY = 'publication:next_boundary'
+NO_BOUNDARY = 'none'
+
+
+def next_publication_boundary():
+    """Момент, когда в ленте появится ближайший отложенный пост.
+
+    Значение кэшируется до самой границы: после неё пересчитывается
+    следующая. Сохранение и удаление постов и категорий сбрасывают его.
+    Читается с основной базы, как и всё, что попадает в общий кэш.
+    """
+    from blog.models import Post
+
+    now = timezone.now()
+    boundary = cache.get(BOUNDARY_KEY)
+    if boundary == NO_BOUNDARY:
+        return None
+    if boundary is not None and boundary > now:
+        return boundary
+    with primary():
+        boundary = Post.objects.filter(
+            is_published=True,
+            category__is_published=True,
+            pub_date__gt=now
+        ).order_by(
+            'pub_date'
+        ).values_list(
+            'pub_date',
+            flat=True
+        ).first()
+    if boundary is None:
+        cache.set(BOUNDARY_KEY, NO_BOUNDARY, None)
+    else:
+        cache.set(
+            BOUNDARY_KEY,
+            boundary,
+            max(int((boundary - now).total_seconds()), 1)
+        )
+    return boundary
+
+
+def reset_publication_boundary():
+    """Забывает границу; она будет пересчитана при следующем запросе."""
+    cache.delete(BOUNDARY_KEY)
+
+
+def timeout_until_boundary(timeout):
+    """Ограничивает время жизни кэша ближайшей границей публикации."""
+    boundary = next_publication_boundary()
+    if boundary is not None:
+        timeout = min(
+            timeout,
+            (boundary - timezone.now()).total_seconds()
+        )
+    return int(timeout)
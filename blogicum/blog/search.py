@@ -0,0 +1,141 @@
+"""Полнотекстовый поиск по публикациям на SQLite FTS5."""
+
+import re
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+FTS_TABLE = 'blog_post_fts'
+# Докуда дошла пересборка индекса в каждом диапазоне id постов.
+PROGRESS_TABLE = 'blog_post_fts_progress'
+# Веса bm25 для столбцов title и text.
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+SNIPPET_TOKENS = 24
+# Ранжируются только столько самых новых видимых совпадений: bm25 по
+# всем постам с частым словом на миллионе записей занимает секунды.
+SEARCH_CANDIDATES = 1000
+# Короче этого последнее слово ищется целиком, а не по префиксу.
+MIN_PREFIX_LENGTH = 3
+# Границы найденных слов во фрагментах; заменяются на <mark> после
+# экранирования, поэтому HTML из текста поста не попадает в страницу.
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+WORD = re.compile(r'\w+')
+
+
+def match_expression(query):
+    """Запрос пользователя в синтаксисе MATCH: все слова запроса.
+
+    Каждое слово берётся в кавычки, так что операторы FTS5 из строки
+    поиска не интерпретируются; последнее ищется ещё и по префиксу.
+    Пустая строка — если слов нет.
+    """
+    terms = [f'"{word}"' for word in WORD.findall(query.lower())]
+    if terms and len(terms[-1]) - 2 >= MIN_PREFIX_LENGTH:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def matching(posts, match):
+    """Публикации из posts, подходящие под выражение MATCH."""
+    return posts.extra(
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = blog_post.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[match],
+    )
+
+
+def candidate_floor(posts, match):
+    """Граница SEARCH_CANDIDATES самых новых совпадений среди posts.
+
+    Возвращает (наименьший id кандидата, есть ли совпадения старше);
+    (0, False), если совпадений не больше SEARCH_CANDIDATES. Порядок
+    по rowid индекса FTS5 отдаёт сам, без сортировки всех совпадений.
+    """
+    ids = list(
+        matching(posts, match).extra(
+            order_by=[f'-{FTS_TABLE}.rowid']
+        ).values_list(
+            'id', flat=True
+        )[SEARCH_CANDIDATES - 1:SEARCH_CANDIDATES + 1]
+    )
+    if not ids:
+        return 0, False
+    return ids[0], len(ids) > 1
+
+
+def index_post(post):
+    """Добавляет публикацию в индекс или обновляет её."""
+    replace_rows(post.pk - 1, post.pk, [(post.pk, post.title, post.text)])
+
+
+def replace_rows(after_id, last_id, rows):
+    """Заменяет строки индекса с rowid в (after_id, last_id] на rows.
+
+    rows — кортежи (id, title, text); строки удалённых постов из
+    этого диапазона пропадают из индекса.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid > %s AND rowid <= %s',
+            [after_id, last_id]
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            'VALUES (%s, %s, %s)',
+            rows
+        )
+
+
+def unindex_post(post_id):
+    """Убирает публикацию из индекса."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id]
+        )
+
+
+def search_posts(posts, query):
+    """Публикации из posts, подходящие под запрос, по убыванию релевантности.
+
+    Ранжируются только SEARCH_CANDIDATES самых новых подходящих
+    публикаций из posts. Возвращает (публикации, отброшены ли более
+    старые совпадения). У каждой публикации есть атрибуты
+    title_snippet и text_snippet с отмеченными совпадениями; выводить
+    их нужно через фильтр highlight.
+    """
+    match = match_expression(query)
+    floor, truncated = candidate_floor(posts, match)
+    return matching(posts, match).extra(
+        where=[f'{FTS_TABLE}.rowid >= %s'],
+        params=[floor],
+        select={
+            'search_rank': (
+                f'bm25({FTS_TABLE}, {TITLE_WEIGHT}, {TEXT_WEIGHT})'
+            ),
+            'title_snippet': (
+                f"highlight({FTS_TABLE}, 0, '{MARK_START}', '{MARK_END}')"
+            ),
+            'text_snippet': (
+                f"snippet({FTS_TABLE}, 1, '{MARK_START}', '{MARK_END}', "
+                f"'…', {SNIPPET_TOKENS})"
+            ),
+        },
+    ).order_by('search_rank', '-pub_date'), truncated
+
+
+def highlight(snippet):
+    """Экранирует фрагмент и оборачивает совпадения в <mark>."""
+    return mark_safe(
+        escape(snippet).replace(
+            MARK_START, '<mark>'
+        ).replace(
+            MARK_END, '</mark>'
+        )
+    )
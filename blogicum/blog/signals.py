@@ -0,0 +1,186 @@
+"""Файл сигналов."""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from blog.caching import (COUNT_GENERATION_KEY, POST_CARD_GENERATION_KEY,
+                          bump_generation, invalidate_pages)
+from blog.images import delete_image_files
+from blog.jobs import enqueue_image_job
+from blog.models import (IMAGE_PENDING, IMAGE_UNPROCESSED, Category, Comment,
+                         Location, Post)
+from blog.publication import reset_publication_boundary
+from blog.search import index_post, unindex_post
+
+
+User = get_user_model()
+
+
+def invalidate_post_pages(post_id, author_id, *category_ids):
+    """Сбрасывает кэш страниц, на которых виден пост."""
+    slugs = Category.objects.filter(
+        id__in=[pk for pk in category_ids if pk]
+    ).values_list('slug', flat=True)
+    usernames = User.objects.filter(
+        pk=author_id
+    ).values_list('username', flat=True)
+    invalidate_pages(
+        'feed',
+        f'post:{post_id}',
+        *(f'category:{slug}' for slug in slugs),
+        *(f'author:{username}' for username in usernames)
+    )
+
+
+def release_image(name):
+    """Удаляет файл изображения, если на него не ссылается ни один пост.
+
+    Одинаковые загрузки хранятся одним файлом, поэтому счётчиком
+    ссылок служит число постов с этим именем в поле image. После
+    фиксации ссылки проверяются ещё раз в пишущей транзакции: при
+    BEGIN IMMEDIATE она ждёт Post.save, который как раз сохраняет
+    такой же файл, а сохранения после неё запишут файл заново.
+    """
+    if not name or Post.objects.filter(image=name).exists():
+        return
+    storage = Post._meta.get_field('image').storage
+
+    def delete_unreferenced():
+        with transaction.atomic():
+            if not Post.objects.filter(image=name).exists():
+                delete_image_files(name, storage)
+
+    transaction.on_commit(delete_unreferenced)
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, **kwargs):
+    """Увеличивает счётчик комментариев поста при добавлении комментария."""
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, **kwargs):
+    """Уменьшает счётчик комментариев поста при удалении комментария."""
+    Post.objects.filter(
+        pk=instance.post_id,
+        comment_count__gt=0
+    ).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    """Сбрасывает кэш страниц поста при изменении комментариев."""
+    post = Post.objects.filter(
+        pk=instance.post_id
+    ).values('author_id', 'category_id').first()
+    if post:
+        invalidate_post_pages(
+            instance.post_id,
+            post['author_id'],
+            post['category_id']
+        )
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_state(sender, instance, **kwargs):
+    """Запоминает прежние категорию и изображение поста до сохранения.
+
+    Изображение и поля его обработки принадлежат заданию из очереди.
+    Если изображение не меняли с момента чтения поста, их значения
+    берутся из базы: иначе экземпляр, прочитанный до окончания
+    обработки, вернул бы имя удалённого файла и статус «в обработке».
+    """
+    previous = Post.objects.filter(
+        pk=instance.pk
+    ).values(
+        'category_id', 'image', 'image_status', 'image_renditions'
+    ).first() if instance.pk else None
+    instance._previous_category_id = previous and previous['category_id']
+    instance._previous_image = previous and previous['image']
+    loaded = getattr(instance, '_loaded_image', None)
+    if previous and loaded is not None and instance.image.name == loaded:
+        instance.image = previous['image']
+        instance.image_status = previous['image_status']
+        instance.image_renditions = previous['image_renditions']
+    instance._image_changed = (
+        previous is None or previous['image'] != instance.image.name
+    )
+    if instance._image_changed:
+        instance.image_renditions = ''
+        instance.image_status = (
+            IMAGE_PENDING if instance.image else IMAGE_UNPROCESSED
+        )
+
+
+@receiver(post_save, sender=Post)
+def process_post_image(sender, instance, **kwargs):
+    """Ставит новое изображение в очередь и освобождает прежнее."""
+    if not getattr(instance, '_image_changed', False):
+        return
+    if instance.image:
+        enqueue_image_job(instance)
+    release_image(instance._previous_image)
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance, **kwargs):
+    """Освобождает изображение удалённого поста."""
+    release_image(instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """Обновляет пост в поисковом индексе, если менялся его текст."""
+    if update_fields and not {'title', 'text'} & set(update_fields):
+        return
+    index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Убирает удалённый пост из поискового индекса."""
+    unindex_post(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    """Сбрасывает кэш страниц, числа постов и границу публикации."""
+    reset_publication_boundary()
+    bump_generation(COUNT_GENERATION_KEY)
+    invalidate_post_pages(
+        instance.pk,
+        instance.author_id,
+        instance.category_id,
+        getattr(instance, '_previous_category_id', None)
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_post_cards(sender, **kwargs):
+    """Сбрасывает кэш карточек при изменении категорий и местоположений."""
+    if sender is Category:
+        reset_publication_boundary()
+        bump_generation(COUNT_GENERATION_KEY)
+    bump_generation(POST_CARD_GENERATION_KEY)
+    invalidate_pages('all')
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_pages(sender, update_fields=None, **kwargs):
+    """Сбрасывает кэш страниц при правке пользователя, кроме входа."""
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        invalidate_pages('all')
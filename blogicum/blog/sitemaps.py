@@ -0,0 +1,84 @@
+"""Потоковая запись sitemap-файлов на диск."""
+
+import os
+from xml.sax.saxutils import escape
+
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+# Ограничение протокола sitemaps.org на число адресов в одном файле.
+URLS_PER_SITEMAP = 50000
+
+
+def lastmod(moment):
+    return moment.isoformat(timespec='seconds')
+
+
+class SitemapWriter:
+    """Пишет адреса в файлы <prefix>-N.xml по URLS_PER_SITEMAP штук.
+
+    Каждый адрес сразу уходит в файл, так что память не растёт с
+    числом адресов. Файл пишется под временным именем и заменяет
+    прежний только целиком.
+    """
+
+    def __init__(self, directory, prefix, per_file=URLS_PER_SITEMAP):
+        self.directory = directory
+        self.prefix = prefix
+        self.per_file = per_file
+        self.files = []
+        self.file = None
+
+    def add(self, location, modified=None):
+        if self.file is None or self.count == self.per_file:
+            self.close()
+            self.open()
+        self.file.write(f'<url><loc>{escape(location)}</loc>')
+        if modified is not None:
+            self.file.write(f'<lastmod>{lastmod(modified)}</lastmod>')
+            if self.modified is None or modified > self.modified:
+                self.modified = modified
+        self.file.write('</url>\n')
+        self.count += 1
+
+    def open(self):
+        self.name = f'{self.prefix}-{len(self.files) + 1}.xml'
+        self.file = open(
+            os.path.join(self.directory, self.name + '.tmp'),
+            'w',
+            encoding='utf-8'
+        )
+        self.file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+        )
+        self.count = 0
+        self.modified = None
+
+    def close(self):
+        """Дописывает текущий файл; возвращает [(имя, lastmod)]."""
+        if self.file is not None:
+            self.file.write('</urlset>\n')
+            self.file.close()
+            os.replace(
+                os.path.join(self.directory, self.name + '.tmp'),
+                os.path.join(self.directory, self.name)
+            )
+            self.files.append((self.name, self.modified))
+            self.file = None
+        return self.files
+
+
+def write_index(directory, name, sitemaps):
+    """Пишет индекс sitemap; sitemaps — пары (адрес, lastmod)."""
+    path = os.path.join(directory, name)
+    with open(path + '.tmp', 'w', encoding='utf-8') as index:
+        index.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n'
+        )
+        for location, modified in sitemaps:
+            index.write(f'<sitemap><loc>{escape(location)}</loc>')
+            if modified is not None:
+                index.write(f'<lastmod>{lastmod(modified)}</lastmod>')
+            index.write('</sitemap>\n')
+        index.write('</sitemapindex>\n')
+    os.replace(path + '.tmp', path)
@@ -0,0 +1,57 @@
+"""Хранилище изображений с адресацией по содержимому."""
+
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Сохраняет файл под SHA-256 его содержимого.
+
+    Хэш считается по ходу записи загрузки во временный файл, после
+    чего тот атомарно переименовывается в <каталог>/<ab>/<хэш><.ext>.
+    Одинаковые файлы хранятся один раз; удалять их должен тот, кто
+    знает, что на файл больше никто не ссылается.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        os.makedirs(self.path(directory or '.'), exist_ok=True)
+        digest = hashlib.sha256()
+        handle, temp_path = tempfile.mkstemp(
+            dir=self.path(directory or '.'),
+            prefix='.upload-'
+        )
+        try:
+            with os.fdopen(handle, 'wb') as temp_file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+            hexdigest = digest.hexdigest()
+            name = posixpath.join(
+                directory, hexdigest[:2], hexdigest + extension
+            )
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.chmod(temp_path, self.file_permissions_mode or 0o644)
+                os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
+
+
+image_storage = ContentAddressedStorage()
@@ -0,0 +1,20 @@
+"""Теги шаблонов блога."""
+
+from django import template
+
+from blog.caching import render_post_cards
+from blog.search import highlight as highlight_snippet
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Лента карточек постов из кэша фрагментов."""
+    return render_post_cards(posts)
+
+
+@register.filter
+def highlight(snippet):
+    """Фрагмент результата поиска с выделенными совпадениями."""
+    return highlight_snippet(snippet)
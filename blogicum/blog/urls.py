@@ -2,7 +2,8 @@
 
 from django.urls import path
 
-from blog import views
+from blog import api, feeds, views
+from blog.caching import cache_anonymous_page
 
 
 app_name = 'blog'
@@ -13,11 +14,70 @@ urlpatterns = [
         views.index,
         name='index'
     ),
+    path(
+        'api/posts/',
+        api.index,
+        name='api_index'
+    ),
+    path(
+        'api/category/<slug:category_slug>/',
+        api.category_posts,
+        name='api_category_posts'
+    ),
+    path(
+        'api/profile/<str:username>/',
+        api.profile,
+        name='api_profile'
+    ),
+    path(
+        'feed/',
+        cache_anonymous_page('feed')(feeds.LatestPostsFeed()),
+        name='feed_rss'
+    ),
+    path(
+        'feed/atom/',
+        cache_anonymous_page('feed')(feeds.LatestPostsAtomFeed()),
+        name='feed_atom'
+    ),
+    path(
+        'category/<slug:category_slug>/feed/',
+        cache_anonymous_page('category:{category_slug}')(
+            feeds.CategoryFeed()
+        ),
+        name='category_feed_rss'
+    ),
+    path(
+        'category/<slug:category_slug>/feed/atom/',
+        cache_anonymous_page('category:{category_slug}')(
+            feeds.CategoryAtomFeed()
+        ),
+        name='category_feed_atom'
+    ),
+    path(
+        'profile/<str:username>/feed/',
+        cache_anonymous_page('author:{username}')(feeds.AuthorFeed()),
+        name='profile_feed_rss'
+    ),
+    path(
+        'profile/<str:username>/feed/atom/',
+        cache_anonymous_page('author:{username}')(feeds.AuthorAtomFeed()),
+        name='profile_feed_atom'
+    ),
+    path(
+        'search/',
+        views.search,
+        name='search'
+    ),
     path(
         'posts/<int:post_id>/',
         views.post_detail,
         name='post_detail'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.post_comments,
+        name='post_comments'
+    ),
     path(
         'category/<slug:category_slug>/',
         views.category_posts,
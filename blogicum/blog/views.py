@@ -1,20 +1,25 @@
 """Views функции blogicum."""
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count
-from django.http import Http404
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.utils.http import urlencode
 
+from blog.caching import cache_anonymous_page, feed_count_options
 from blog.forms import CommentForm, PostForm, UserForm
 from blog.models import Category, Comment, Post
-from blogicum.utils import get_paginator
+from blog.search import SEARCH_CANDIDATES, match_expression, search_posts
+from blogicum.constants import COUNT_COMMENTS, PAGINATION_ESTIMATED
+from blogicum.utils import CursorPaginator, get_paginator
 
 
 User = get_user_model()
 
 
+@cache_anonymous_page('feed')
 def index(request):
     """View функция главной страницы blogicum."""
     return render(
@@ -23,24 +28,16 @@ def index(request):
         {
             'page_obj': get_paginator(
                 request,
-                Post.published_posts.select_related(
-                    'author',
-                    'location',
-                    'category'
-                ).order_by(
-                    '-pub_date'
-                ).annotate(
-                    comment_count=Count(
-                        'comments'
-                    )
-                )
+                Post.published_posts.for_feed(),
+                mode=settings.INDEX_PAGINATION,
+                **feed_count_options('feed')
             )
         }
     )
 
 
-def post_detail(request, post_id):
-    """View функция подробной страницы."""
+def get_visible_post(request, post_id):
+    """Возвращает пост, если он доступен текущему пользователю."""
     post = get_object_or_404(
         Post.objects.select_related(
             'category',
@@ -53,25 +50,79 @@ def post_detail(request, post_id):
         and post.is_published
     ):
         raise Http404('Пост не найден/доступен')
+    return post
+
+
+def get_comments_page(request, post):
+    """Страница комментариев поста, начиная с курсора ?after=."""
+    return CursorPaginator(
+        post.comments.select_related('author'),
+        COUNT_COMMENTS,
+        field='created_at',
+        descending=False
+    ).get_page(request.GET.get('after'))
+
+
+@cache_anonymous_page('post:{post_id}')
+def post_detail(request, post_id):
+    """View функция подробной страницы."""
+    post = get_visible_post(request, post_id)
     return render(
         request,
         'blog/detail.html',
         {
             'post': post,
             'form': CommentForm(),
-            'comments': post.comments.filter(post_id=post_id)
+            'comments': get_comments_page(request, post)
         }
     )
 
 
-def category_posts(request, category_slug):
-    """View функция категорий."""
+@cache_anonymous_page('post:{post_id}')
+def post_comments(request, post_id):
+    """View функция подгрузки комментариев: HTML-фрагмент или JSON."""
+    post = get_visible_post(request, post_id)
+    comments = get_comments_page(request, post)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'comments': [
+                {
+                    'id': comment.id,
+                    'author': comment.author.username,
+                    'text': comment.text,
+                    'created_at': comment.created_at.isoformat(),
+                }
+                for comment in comments
+            ],
+            'next': comments.next_cursor,
+        })
+    return render(
+        request,
+        'includes/comment_list.html',
+        {
+            'post': post,
+            'comments': comments
+        }
+    )
+
+
+def get_category_feed(category_slug):
+    """Опубликованная категория и лента её постов."""
     category = get_object_or_404(
         Category.objects.filter(
             slug=category_slug
         ),
         is_published=True,
     )
+    return category, category.posts(
+        manager='published_posts'
+    ).for_feed()
+
+
+@cache_anonymous_page('category:{category_slug}')
+def category_posts(request, category_slug):
+    """View функция категорий."""
+    category, posts = get_category_feed(category_slug)
     return render(
         request,
         'blog/category.html',
@@ -79,14 +130,42 @@ def category_posts(request, category_slug):
             'category': category,
             'page_obj': get_paginator(
                 request,
-                category.posts(
-                    manager='published_posts'
-                ).all()
+                posts,
+                mode=PAGINATION_ESTIMATED,
+                **feed_count_options(f'category:{category_slug}')
             )
         }
     )
 
 
+def search(request):
+    """View функция поиска по заголовкам и текстам постов."""
+    query = request.GET.get('q', '').strip()
+    page_obj = None
+    truncated = False
+    if match_expression(query):
+        posts, truncated = search_posts(
+            Post.published_posts.for_feed(), query
+        )
+        page_obj = get_paginator(
+            request,
+            posts,
+            mode=PAGINATION_ESTIMATED,
+            **feed_count_options('feed', match_expression(query))
+        )
+    return render(
+        request,
+        'blog/search.html',
+        {
+            'query': query,
+            'page_obj': page_obj,
+            'truncated': truncated,
+            'search_candidates': SEARCH_CANDIDATES,
+            'page_query': urlencode({'q': query}) + '&'
+        }
+    )
+
+
 @login_required
 def create_post(request):
     form = PostForm(
@@ -112,28 +191,23 @@ def create_post(request):
     )
 
 
-def profile(request, username):
+def get_profile_feed(request, username):
+    """Автор и лента его постов; неопубликованные видит только он."""
     profile = get_object_or_404(
         User,
         username=username
     )
-    posts = Post.objects.select_related(
-        'category',
-        'location',
-        'author'
-    ).filter(author=profile).annotate(
-        comment_count=Count(
-            'comments'
-        )
-    ).order_by(
-        '-pub_date'
+    posts = Post.objects.for_feed().filter(
+        author=profile
     )
     if profile.id != request.user.id:
-        posts = posts.filter(
-            pub_date__lte=timezone.now(),
-            category__is_published=True,
-            is_published=True
-        )
+        posts = posts.published()
+    return profile, posts
+
+
+@cache_anonymous_page('author:{username}')
+def profile(request, username):
+    profile, posts = get_profile_feed(request, username)
     return render(
         request,
         'blog/profile.html',
@@ -0,0 +1,89 @@
+"""SQLite с настраиваемыми PRAGMA, BEGIN IMMEDIATE и проверкой соединений."""
+
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def count(event):
+    with _metrics_lock:
+        _metrics[event] += 1
+
+
+def connection_metrics():
+    """Счётчики новых и повторно использованных соединений.
+
+    opened и reused считаются по первому обращению к базе в каждом
+    запросе к сайту, health_check_failed — по непрошедшим проверкам.
+    """
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    opened = metrics.get('opened', 0)
+    reused = metrics.get('reused', 0)
+    return {
+        'opened': opened,
+        'reused': reused,
+        'health_check_failed': metrics.get('health_check_failed', 0),
+        'reuse_rate': reused / (opened + reused) if opened + reused else 0.0,
+    }
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Выполняет SQLITE_PRAGMAS на каждом новом соединении.
+
+    Транзакции открываются в режиме SQLITE_TRANSACTION_MODE: при
+    IMMEDIATE пишущая транзакция берёт блокировку сразу и ждёт её
+    busy_timeout, а не падает с «database is locked» при попытке
+    повысить уровень блокировки посреди транзакции.
+
+    Если соединение сохраняется между запросами (CONN_MAX_AGE) и
+    включён CONN_HEALTH_CHECKS, перед первым использованием в запросе
+    оно проверяется и при ошибке открывается заново.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_done = False
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        mode = settings.SQLITE_TRANSACTION_MODE
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
+
+    def is_usable(self):
+        try:
+            self.connection.execute('SELECT 1')
+        except base.Database.Error:
+            return False
+        return True
+
+    def close_if_unusable_or_obsolete(self):
+        # Вызывается в начале и в конце каждого запроса к сайту.
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def ensure_connection(self):
+        if not self.health_check_done and not self.in_atomic_block:
+            self.health_check_done = True
+            if self.connection is None:
+                count('opened')
+            elif (
+                self.settings_dict.get('CONN_HEALTH_CHECKS')
+                and not self.is_usable()
+            ):
+                count('health_check_failed')
+                count('opened')
+                self.close()
+            else:
+                count('reused')
+        super().ensure_connection()
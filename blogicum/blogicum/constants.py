@@ -3,3 +3,8 @@
 MAX_NAME_LENG = 256
 CHARACTER_RESTRICTION = 10
 COUNT_POSTS = 10
+COUNT_COMMENTS = 20
+COUNT_FEED_ITEMS = 20
+PAGINATION_PAGE = 'page'
+PAGINATION_CURSOR = 'cursor'
+PAGINATION_ESTIMATED = 'estimated'
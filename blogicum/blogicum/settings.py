@@ -22,6 +22,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Первым, чтобы время запроса включало все остальные middleware.
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -29,6 +31,9 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaMiddleware',
+    'core.middleware.QueryInspectorMiddleware',
+    'core.middleware.TemplateProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
@@ -56,11 +61,87 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'blogicum.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт между запросами до минуты и перед
+        # повторным использованием проверяется запросом SELECT 1.
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Выполняются на каждом новом соединении с SQLite.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер в килобайтах.
+    'cache_size': -64000,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+# DEFERRED (по умолчанию в SQLite), IMMEDIATE или EXCLUSIVE.
+SQLITE_TRANSACTION_MODE = 'IMMEDIATE'
+
+# Псевдонимы из DATABASES, с которых читают view из REPLICA_VIEWS.
+# Для проверки локально добавьте в DATABASES, например,
+# 'replica': {'ENGINE': 'blogicum.backends.sqlite3',
+#             'NAME': BASE_DIR / 'db_replica.sqlite3'},
+# укажите его здесь и запустите manage.py sync_replicas --interval 1.
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+REPLICA_VIEWS = (
+    'blog:index',
+    'blog:category_posts',
+    'blog:profile',
+    'blog:post_detail',
+    'blog:search',
+    'blog:api_index',
+    'blog:api_category_posts',
+    'blog:api_profile',
+    'blog:feed_rss',
+    'blog:feed_atom',
+    'blog:category_feed_rss',
+    'blog:category_feed_atom',
+    'blog:profile_feed_rss',
+    'blog:profile_feed_atom',
+)
+# Сколько секунд после записи клиент читает с основной базы.
+REPLICA_PIN_SECONDS = 10
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+PAGE_CACHE_TIMEOUT = 60 * 5
+FEED_COUNT_TIMEOUT = 60 * 60
+
+# Гистограммы времени и SQL-запросов по view, отдаются на /metrics/.
+METRICS_ENABLED = True
+# С каких адресов можно забирать /metrics/.
+METRICS_ALLOWED_IPS = ('127.0.0.1',)
+# Профиль отрисовки шаблонов на /metrics/templates/; замедляет отрисовку.
+TEMPLATE_PROFILING = False
+
+QUERY_INSPECTOR_ENABLED = DEBUG
+QUERY_REPEAT_THRESHOLD = 3
+# Максимум SQL-запросов на один запрос к view (с сессией и промахом кэша).
+QUERY_BUDGETS = {
+    'blog:index': 6,
+    'blog:post_detail': 6,
+    'blog:post_comments': 4,
+    'blog:category_posts': 6,
+    'blog:profile': 7,
+    'blog:edit_profile': 6,
+    'blog:search': 6,
+    'blog:api_index': 3,
+    'blog:api_category_posts': 4,
+    'blog:api_profile': 4,
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -93,16 +174,56 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
+STATIC_ROOT = BASE_DIR / 'static_root'
+# collectstatic добавляет хэш содержимого к именам файлов, пишет
+# manifest и сжатые копии .gz (и .br, если установлен пакет Brotli).
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+# Для файлов без хэша в имени; файлы с хэшем кэшируются навсегда.
+STATIC_CACHE_MAX_AGE = 3600
+STATIC_ACCEL_PREFIX = '/protected-static/'
+
+# Адрес сайта для абсолютных ссылок в sitemap.
+SITE_URL = 'http://127.0.0.1:8000'
+# Куда build_sitemaps пишет sitemap.xml и его части.
+SITEMAP_ROOT = BASE_DIR / 'sitemaps'
+SITEMAP_CACHE_MAX_AGE = 3600
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
+# 'page' — нумерованные страницы, 'estimated' — нумерованные страницы
+# с закэшированным числом постов, 'cursor' — keyset-пагинация ?after=/?before=
+INDEX_PAGINATION = 'estimated'
+
 LOGIN_REDIRECT_URL = 'blog:index'
 LOGIN_URL = 'login'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_CACHE_MAX_AGE = 3600
+# Имена файлов под этими префиксами — хэши содержимого, они не меняются.
+MEDIA_IMMUTABLE_PREFIXES = ('blogicum_images/',)
+# None — файлы отдаёт Django; 'x-accel-redirect' (nginx) или 'x-sendfile'
+# (Apache, lighttpd) — тело отправляет прокси-сервер. Для nginx нужен
+# internal-location MEDIA_ACCEL_PREFIX с alias на MEDIA_ROOT.
+SENDFILE_BACKEND = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+IMAGE_RENDITION_WIDTHS = (320, 640, 1024)
+# Разбирать очередь изображений пулом потоков в процессе сайта;
+# при False её разбирает команда process_image_jobs. Потоки теряют
+# отложенные повторы при перезапуске сайта, поэтому в production нужна
+# команда process_image_jobs, а этот режим — для разработки.
+IMAGE_JOBS_INLINE = DEBUG
+IMAGE_JOB_WORKERS = 2
+IMAGE_JOB_MAX_ATTEMPTS = 3
+# Пауза перед повтором неудачного задания, секунд; удваивается с
+# каждой попыткой.
+IMAGE_JOB_RETRY_DELAY = 60
+# Задание в обработке дольше стольких секунд считается брошенным
+# упавшим обработчиком и возвращается в очередь.
+IMAGE_JOB_STALE_AFTER = 600
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
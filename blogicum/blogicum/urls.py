@@ -1,11 +1,14 @@
+import re
+
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
-from django.urls import include, path
-from django.urls import path, reverse_lazy
+from django.urls import include, path, re_path, reverse_lazy
 from django.views.generic.edit import CreateView
 
+from core.sendfile import serve_media, serve_sitemap, serve_static
+from core.views import db_health, prometheus_metrics, template_profile
+
 
 handler404 = 'core.views.page_not_found'
 handler500 = 'core.views.internal_error'
@@ -49,7 +52,40 @@ urlpatterns = [
         'auth/',
         include(patterns)
     ),
-] + static(
-    settings.MEDIA_URL,
-    document_root=settings.MEDIA_ROOT
-)
+    path(
+        'sitemap.xml',
+        serve_sitemap,
+        {'path': 'sitemap.xml'},
+        name='sitemap_index'
+    ),
+    re_path(
+        r'^sitemaps/(?P<path>[\w-]+\.xml)$',
+        serve_sitemap,
+        name='sitemap'
+    ),
+    path(
+        'health/db/',
+        db_health,
+        name='db_health'
+    ),
+    path(
+        'metrics/',
+        prometheus_metrics,
+        name='metrics'
+    ),
+    path(
+        'metrics/templates/',
+        template_profile,
+        name='template_profile'
+    ),
+    re_path(
+        r'^%s(?P<path>.+)$' % re.escape(settings.MEDIA_URL.lstrip('/')),
+        serve_media,
+        name='media'
+    ),
+    re_path(
+        r'^%s(?P<path>.+)$' % re.escape(settings.STATIC_URL.lstrip('/')),
+        serve_static,
+        name='static'
+    ),
+]
@@ -1,10 +1,191 @@
-from django.core.paginator import Paginator
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Sequence
 
-from blogicum.constants import COUNT_POSTS
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
 
+from blogicum.constants import (COUNT_POSTS, PAGINATION_CURSOR,
+                                PAGINATION_ESTIMATED, PAGINATION_PAGE)
+from core.routers import primary
 
-def get_paginator(request, posts):
+
+def encode_cursor(moment, pk):
+    """Упаковывает позицию записи в непрозрачный токен."""
+    raw = f'{moment.isoformat()},{pk}'.encode()
+    return urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Распаковывает токен; для битого токена возвращает None."""
+    if not token:
+        return None
+    try:
+        raw = urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        moment, pk = raw.rsplit(',', 1)
+        moment = parse_datetime(moment)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if moment is None:
+        return None
+    return moment, pk
+
+
+class CursorPage(Sequence):
+    """Страница курсорной пагинации с интерфейсом, близким к Page."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<Cursor page after %r>' % self.previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинатор по паре (field, id).
+
+    Вместо OFFSET и COUNT(*) каждая страница выбирается условием
+    «строго после курсора» с LIMIT per_page + 1, поэтому глубокие
+    страницы стоят столько же, сколько первая. По умолчанию идёт
+    по pub_date от новых записей к старым.
+    """
+
+    def __init__(self, object_list, per_page, field='pub_date',
+                 descending=True):
+        self.object_list = object_list
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+
+    def _slice(self, cursor, forward):
+        descending = self.descending == forward
+        prefix = '-' if descending else ''
+        lookup = 'lt' if descending else 'gt'
+        queryset = self.object_list.order_by(
+            prefix + self.field,
+            prefix + 'id'
+        )
+        if cursor:
+            value, pk = cursor
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value})
+                | Q(**{self.field: value, f'id__{lookup}': pk})
+            )
+        rows = list(queryset[:self.per_page + 1])
+        return rows[:self.per_page], len(rows) > self.per_page
+
+    def _page_after(self, cursor):
+        return self._slice(cursor, forward=True)
+
+    def _page_before(self, cursor):
+        rows, more = self._slice(cursor, forward=False)
+        return rows[::-1], more
+
+    def _cursor(self, row):
+        return encode_cursor(getattr(row, self.field), row.id)
+
+    def get_page(self, after=None, before=None):
+        """Возвращает страницу после токена after или перед токеном before."""
+        rows = None
+        before_cursor = decode_cursor(before)
+        if before_cursor:
+            rows, has_previous = self._page_before(before_cursor)
+            has_next = True
+        if not rows:
+            after_cursor = decode_cursor(after)
+            rows, has_next = self._page_after(after_cursor)
+            has_previous = after_cursor is not None
+        if not rows:
+            return CursorPage(rows, self, None, None)
+        return CursorPage(
+            rows,
+            self,
+            self._cursor(rows[-1]) if has_next else None,
+            self._cursor(rows[0]) if has_previous else None,
+        )
+
+
+class WindowedPage(Page):
+    """Страница с окном номеров вокруг текущей вместо полного списка."""
+
+    @property
+    def page_window(self):
+        return self.paginator.get_elided_page_range(
+            self.number,
+            on_each_side=2,
+            on_ends=1
+        )
+
+
+class WindowedPaginator(Paginator):
+    def _get_page(self, *args, **kwargs):
+        return WindowedPage(*args, **kwargs)
+
+
+class EstimatedCountPaginator(WindowedPaginator):
+    """Пагинатор, берущий общее число записей из кэша.
+
+    COUNT(*) выполняется только при промахе; ключ count_key должен
+    меняться при записи в ленту, тогда число пересчитывается сразу.
+    Пересчёт идёт по основной базе: число с отставшей реплики попало
+    бы в кэш под новым ключом.
+    """
+
+    def __init__(self, object_list, per_page, count_key, timeout, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+        self.timeout = timeout
+
+    @cached_property
+    def count(self):
+        count = cache.get(self.count_key)
+        if count is None:
+            with primary():
+                count = super().count
+            cache.set(self.count_key, count, self.timeout)
+        return count
+
+
+def get_paginator(request, posts, mode=PAGINATION_PAGE, count_key=None,
+                  count_timeout=None):
     """View фнукция пагинатора."""
-    paginator = Paginator(posts, COUNT_POSTS)
+    if mode == PAGINATION_CURSOR:
+        return CursorPaginator(posts, COUNT_POSTS).get_page(
+            request.GET.get('after'),
+            request.GET.get('before')
+        )
+    if mode == PAGINATION_ESTIMATED and count_key:
+        paginator = EstimatedCountPaginator(
+            posts,
+            COUNT_POSTS,
+            count_key,
+            count_timeout
+        )
+    else:
+        paginator = WindowedPaginator(posts, COUNT_POSTS)
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
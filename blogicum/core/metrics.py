@@ -0,0 +1,202 @@
+"""Гистограммы показателей view в памяти процесса и их вывод для Prometheus.
+
+Значения копятся отдельно в каждом процессе сервера и обнуляются при
+его перезапуске; Prometheus опрашивает каждый процесс и суммирует сам.
+"""
+
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends import django as backend
+
+from blogicum.backends.sqlite3.base import connection_metrics
+
+SECONDS_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+BYTES_BUCKETS = (512, 2048, 8192, 32768, 131072, 524288, 2097152)
+# Имя метрики: (описание, границы корзин).
+METRICS = {
+    'blogicum_view_duration_seconds': (
+        'Полное время обработки запроса.', SECONDS_BUCKETS
+    ),
+    'blogicum_view_db_seconds': (
+        'Время выполнения SQL-запросов.', SECONDS_BUCKETS
+    ),
+    'blogicum_view_queries': (
+        'Число SQL-запросов.', QUERY_BUCKETS
+    ),
+    'blogicum_view_template_seconds': (
+        'Время отрисовки шаблонов.', SECONDS_BUCKETS
+    ),
+    'blogicum_view_response_bytes': (
+        'Размер тела ответа.', BYTES_BUCKETS
+    ),
+}
+# Метка view у запросов, не дошедших до view: 404 и т.п.
+UNRESOLVED = 'unresolved'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# QueryTimer текущего запроса к сайту.
+query_timer = ContextVar('query_timer', default=None)
+# Список из одного числа: время шаблонов текущего запроса.
+template_time = ContextVar('template_time', default=None)
+
+# Имя view: {метрика: Histogram}.
+_histograms = {}
+_lock = threading.Lock()
+
+
+class Histogram:
+    """Число наблюдений в каждой корзине, их сумма и количество."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # Последний элемент — корзина +Inf.
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+def observe(view_name, values):
+    """Добавляет показатели одного запроса; values — {метрика: значение}."""
+    with _lock:
+        histograms = _histograms.get(view_name)
+        if histograms is None:
+            histograms = _histograms[view_name] = {
+                metric: Histogram(buckets)
+                for metric, (_, buckets) in METRICS.items()
+            }
+        for metric, value in values.items():
+            histograms[metric].observe(value)
+
+
+def reset():
+    """Обнуляет все гистограммы."""
+    with _lock:
+        _histograms.clear()
+
+
+def label(value):
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def render():
+    """Все метрики в текстовом формате Prometheus 0.0.4."""
+    with _lock:
+        snapshot = {
+            (metric, view_name): (list(histogram.counts), histogram.sum)
+            for view_name, histograms in _histograms.items()
+            for metric, histogram in histograms.items()
+        }
+    lines = []
+    for metric, (description, buckets) in METRICS.items():
+        lines.append(f'# HELP {metric} {description}')
+        lines.append(f'# TYPE {metric} histogram')
+        for (name, view_name), (counts, total) in sorted(snapshot.items()):
+            if name != metric:
+                continue
+            view = f'view="{label(view_name)}"'
+            cumulative = 0
+            for bound, count in zip(buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(
+                    f'{metric}_bucket{{{view},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f'{metric}_sum{{{view}}} {total}')
+            lines.append(f'{metric}_count{{{view}}} {cumulative}')
+    database = connection_metrics()
+    lines.append(
+        '# HELP blogicum_db_connections_total '
+        'Первые обращения к базе в запросах: новое или сохранённое соединение.'
+    )
+    lines.append('# TYPE blogicum_db_connections_total counter')
+    for state in ('opened', 'reused'):
+        lines.append(
+            f'blogicum_db_connections_total{{state="{state}"}} '
+            f'{database[state]}'
+        )
+    lines.append(
+        '# HELP blogicum_db_health_check_failed_total '
+        'Сохранённые соединения, не прошедшие проверку.'
+    )
+    lines.append('# TYPE blogicum_db_health_check_failed_total counter')
+    lines.append(
+        'blogicum_db_health_check_failed_total '
+        f'{database["health_check_failed"]}'
+    )
+    return '\n'.join(lines) + '\n'
+
+
+class QueryTimer:
+    """Число SQL-запросов и время их выполнения."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+def time_query(execute, sql, params, many, context):
+    """Обёртка execute_wrapper, пишущая запрос в query_timer."""
+    timer = query_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.seconds += perf_counter() - start
+        timer.count += 1
+
+
+def wrap_connection(connection, **kwargs):
+    # В начало списка: execute_wrapper() снимает обёртки с конца.
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_query)
+
+
+def instrument():
+    """Подключает замер SQL-запросов и шаблонов; повторно ничего не делает.
+
+    Обёртка запросов ставится на соединения навсегда, а не на время
+    запроса: connections[alias] в Django стоит микросекунды, и обход
+    всех баз на каждом запросе заметно дороже самого замера.
+    Вложенные отрисовки шаблонов, например render_to_string из тега,
+    уже входят во время внешней и отдельно не считаются.
+    """
+    connection_created.connect(wrap_connection)
+    for connection in connections.all():
+        wrap_connection(connection)
+    original = backend.Template.render
+    if getattr(original, 'timed', False):
+        return
+
+    @wraps(original)
+    def render(self, context=None, request=None):
+        timer = template_time.get()
+        if timer is None:
+            return original(self, context, request)
+        token = template_time.set(None)
+        start = perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            timer[0] += perf_counter() - start
+            template_time.reset(token)
+
+    render.timed = True
+    backend.Template.render = render
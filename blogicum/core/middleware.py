@@ -0,0 +1,205 @@
+"""Контроль SQL-запросов, метрики view и выбор базы данных для запроса."""
+
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.dispatch import Signal
+
+from core import metrics, template_profiler
+from core.routers import use_replica
+
+
+logger = logging.getLogger(__name__)
+
+# Отправляется с аргументами view_name, count, budget, repeated.
+query_budget_exceeded = Signal()
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+IN_LISTS = re.compile(r'\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)')
+
+
+def query_shape(sql):
+    """Форма запроса: SQL без литералов и длины списков IN (...)."""
+    return IN_LISTS.sub('IN (...)', LITERALS.sub('?', sql))
+
+
+class QueryRecorder:
+    """Обёртка execute_wrapper, запоминающая выполненные запросы."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold):
+        """Формы запросов, повторившиеся не меньше threshold раз."""
+        return {
+            shape: count
+            for shape, count in Counter(
+                query_shape(sql) for sql in self.queries
+            ).items()
+            if count >= threshold
+        }
+
+
+class QueryInspectorMiddleware:
+    """Считает запросы каждого view и ищет признаки N+1.
+
+    Повторяющиеся запросы одной формы пишутся в лог, превышение
+    бюджета из settings.QUERY_BUDGETS дополнительно отправляет сигнал
+    query_budget_exceeded, на который подписан pytest-плагин.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSPECTOR_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        match = request.resolver_match
+        view_name = match.view_name if match else request.path
+        count = len(recorder.queries)
+        repeated = recorder.repeated(settings.QUERY_REPEAT_THRESHOLD)
+        for shape, times in repeated.items():
+            logger.warning(
+                'Возможен N+1 в %s: запрос выполнен %s раз: %s',
+                view_name, times, shape
+            )
+        budget = settings.QUERY_BUDGETS.get(view_name)
+        if budget is not None and count > budget:
+            logger.warning(
+                '%s выполнил %s запросов при бюджете %s',
+                view_name, count, budget
+            )
+            query_budget_exceeded.send(
+                sender=self.__class__,
+                view_name=view_name,
+                count=count,
+                budget=budget,
+                repeated=repeated,
+            )
+        response['X-Query-Count'] = str(count)
+        return response
+
+
+class ReplicaMiddleware:
+    """Включает чтение с реплик для безопасных запросов к REPLICA_VIEWS.
+
+    После POST и других изменяющих запросов клиент получает cookie,
+    и REPLICA_PIN_SECONDS секунд его чтения идут на основную базу,
+    чтобы он сразу видел свои изменения, даже если реплика отстаёт.
+    """
+
+    pin_cookie = 'read_primary'
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            token = getattr(request, '_replica_token', None)
+            if token is not None:
+                use_replica.reset(token)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            response.set_cookie(
+                self.pin_cookie,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in ('GET', 'HEAD')
+            and self.pin_cookie not in request.COOKIES
+            and request.resolver_match.view_name in settings.REPLICA_VIEWS
+        ):
+            request._replica_token = use_replica.set(True)
+
+
+class MetricsMiddleware:
+    """Пишет показатели каждого запроса в гистограммы core.metrics.
+
+    Время, число SQL-запросов, время шаблонов и размер ответа
+    группируются по имени view, например blog:index.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        metrics.instrument()
+
+    def __call__(self, request):
+        timer = metrics.QueryTimer()
+        templates = [0.0]
+        timer_token = metrics.query_timer.set(timer)
+        templates_token = metrics.template_time.set(templates)
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.template_time.reset(templates_token)
+            metrics.query_timer.reset(timer_token)
+        values = {
+            'blogicum_view_duration_seconds': perf_counter() - start,
+            'blogicum_view_db_seconds': timer.seconds,
+            'blogicum_view_queries': timer.count,
+            'blogicum_view_template_seconds': templates[0],
+        }
+        if not response.streaming:
+            values['blogicum_view_response_bytes'] = len(response.content)
+        elif response.has_header('Content-Length'):
+            values['blogicum_view_response_bytes'] = int(
+                response['Content-Length']
+            )
+        match = request.resolver_match
+        metrics.observe(
+            match.view_name if match else metrics.UNRESOLVED, values
+        )
+        return response
+
+
+class TemplateProfilerMiddleware:
+    """Копит профиль отрисовки шаблонов по view, если TEMPLATE_PROFILING.
+
+    Профиль отдаётся на /metrics/templates/ в формате collapsed stacks.
+    """
+
+    def __init__(self, get_response):
+        if not settings.TEMPLATE_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        template_profiler.instrument()
+
+    def __call__(self, request):
+        profile = template_profiler.Profile()
+        token = template_profiler.current.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            template_profiler.current.reset(token)
+        match = request.resolver_match
+        template_profiler.record(
+            profile, match.view_name if match else metrics.UNRESOLVED
+        )
+        return response
@@ -0,0 +1,28 @@
+"""Pytest-плагин, валящий тест при превышении бюджета запросов view."""
+
+import pytest
+
+from core.middleware import query_budget_exceeded
+
+
+@pytest.fixture(autouse=True)
+def query_budget_guard():
+    """Проваливает тест, если view превысил бюджет из QUERY_BUDGETS."""
+    reports = []
+
+    def collect(sender, view_name, count, budget, repeated, **kwargs):
+        reports.append((view_name, count, budget, repeated))
+
+    query_budget_exceeded.connect(collect)
+    try:
+        yield reports
+    finally:
+        query_budget_exceeded.disconnect(collect)
+    if reports:
+        pytest.fail('\n'.join(
+            f'{view_name}: {count} SQL-запросов при бюджете {budget}'
+            + ''.join(
+                f'\n  {times}× {shape}' for shape, times in repeated.items()
+            )
+            for view_name, count, budget, repeated in reports
+        ), pytrace=False)
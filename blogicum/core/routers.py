@@ -0,0 +1,47 @@
+"""Чтение с реплик базы данных для отдельных view."""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Выставляется ReplicaMiddleware на время view из REPLICA_VIEWS.
+use_replica = ContextVar('use_replica', default=False)
+
+
+@contextmanager
+def primary():
+    """Читает с основной базы внутри блока, даже во view из REPLICA_VIEWS.
+
+    Нужен для данных, которые попадают в общий кэш: иначе ответ
+    отставшей реплики хранится там всё время жизни записи.
+    """
+    token = use_replica.set(False)
+    try:
+        yield
+    finally:
+        use_replica.reset(token)
+
+
+class ReplicaRouter:
+    """Направляет чтение на случайную реплику, запись — на default.
+
+    Реплики используются, только пока включён use_replica; остальной
+    код, включая фоновые задачи, читает с основной базы.
+    """
+
+    def db_for_read(self, model, **hints):
+        if use_replica.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Реплики получают схему вместе с данными при синхронизации.
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,241 @@
+"""Отдача файлов с диска: ETag, Range и передача прокси-серверу."""
+
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseNotModified
+)
+from django.utils._os import safe_join
+from django.utils.http import (
+    http_date, parse_etags, parse_http_date_safe, quote_etag
+)
+
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# Имя, которое дал файлу ManifestStaticFilesStorage: name.<md5[:12]>.ext.
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+PRECOMPRESSED = (
+    ('br', '.br'),
+    ('gzip', '.gz'),
+)
+
+SENDFILE_HEADERS = {
+    'x-accel-redirect': 'X-Accel-Redirect',
+    'x-sendfile': 'X-Sendfile',
+}
+
+
+class FileRange:
+    """Файл, читаемый только в пределах [start, start + length).
+
+    fileno() и tell() отдаются как есть, поэтому wsgi.file_wrapper
+    сервера (gunicorn и т.п.) может отправить диапазон через sendfile,
+    ограничившись Content-Length.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def file_etag(stat):
+    """Сильный ETag из времени изменения и размера файла."""
+    return quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+
+
+def not_modified(request, etag, mtime):
+    """Проверяет If-None-Match, а без него — If-Modified-Since."""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag in etags
+    if_modified_since = parse_http_date_safe(
+        request.META.get('HTTP_IF_MODIFIED_SINCE', '')
+    )
+    return if_modified_since is not None and int(mtime) <= if_modified_since
+
+
+def requested_range(request, etag, size):
+    """Диапазон (start, end) из заголовка Range.
+
+    None — отдать файл целиком: заголовка нет, If-Range не совпал или
+    запрошено несколько диапазонов. ValueError — диапазон вне файла.
+    """
+    header = request.META.get('HTTP_RANGE')
+    if not header or request.META.get('HTTP_IF_RANGE', etag) != etag:
+        return None
+    match = RANGE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def locate(root, path):
+    """Полный путь и stat файла внутри root или Http404."""
+    try:
+        fullpath = safe_join(root, path)
+        stat = os.stat(fullpath)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404(path)
+    if not os.path.isfile(fullpath):
+        raise Http404(path)
+    return fullpath, stat
+
+
+def range_response(request, fullpath, etag, size, content_type):
+    """Ответ с файлом целиком или с запрошенным диапазоном."""
+    try:
+        byte_range = requested_range(request, etag, size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response.headers['Content-Range'] = f'bytes */{size}'
+        return response
+    file = open(fullpath, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            FileRange(file, start, end - start + 1),
+            content_type=content_type,
+            status=206
+        )
+        response.headers['Content-Length'] = end - start + 1
+        response.headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def serve_file(request, root, path, cache_control, accel_prefix=None):
+    """Отдаёт файл path из каталога root.
+
+    Если задан accel_prefix и настройка SENDFILE_BACKEND, тело
+    отправляет прокси-сервер по заголовку X-Accel-Redirect/X-Sendfile;
+    иначе файл отдаётся через FileResponse с поддержкой Range.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath, stat = locate(root, path)
+    etag = file_etag(stat)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': cache_control,
+    }
+    if not_modified(request, etag, stat.st_mtime):
+        response = HttpResponseNotModified()
+        for header, value in headers.items():
+            response.headers[header] = value
+        return response
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    content_type = content_type or 'application/octet-stream'
+    backend = settings.SENDFILE_BACKEND
+    if backend and accel_prefix is not None:
+        response = HttpResponse(content_type=content_type)
+        response.headers[SENDFILE_HEADERS[backend]] = (
+            posixpath.join(accel_prefix, path)
+            if backend == 'x-accel-redirect' else fullpath
+        )
+    else:
+        response = range_response(
+            request, fullpath, etag, stat.st_size, content_type
+        )
+    if response.status_code == 416:
+        return response
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    for header, value in headers.items():
+        response.headers[header] = value
+    return response
+
+
+def serve_media(request, path):
+    """Отдаёт загруженный пользователями файл из MEDIA_ROOT."""
+    immutable = path.startswith(settings.MEDIA_IMMUTABLE_PREFIXES)
+    cache_control = (
+        'public, max-age=31536000, immutable' if immutable
+        else f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+    )
+    return serve_file(
+        request,
+        settings.MEDIA_ROOT,
+        path,
+        cache_control,
+        accel_prefix=settings.MEDIA_ACCEL_PREFIX
+    )
+
+
+def precompressed_path(request, root, path):
+    """Путь к сжатой копии, которую примет клиент, или исходный путь."""
+    accepted = {
+        coding.split(';')[0].strip()
+        for coding in request.META.get('HTTP_ACCEPT_ENCODING', '').split(',')
+    }
+    for coding, extension in PRECOMPRESSED:
+        if coding in accepted and os.path.isfile(
+            os.path.join(root, path + extension)
+        ):
+            return path + extension
+    return path
+
+
+def serve_static(request, path):
+    """Отдаёт собранную collectstatic статику из STATIC_ROOT.
+
+    Файлы с хэшем в имени кэшируются навсегда; если рядом лежит
+    .br/.gz-копия и клиент её примет, отдаётся она.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    immutable = bool(HASHED_NAME.search(path))
+    cache_control = (
+        'public, max-age=31536000, immutable' if immutable
+        else f'public, max-age={settings.STATIC_CACHE_MAX_AGE}'
+    )
+    response = serve_file(
+        request,
+        settings.STATIC_ROOT,
+        precompressed_path(request, settings.STATIC_ROOT, path),
+        cache_control,
+        accel_prefix=settings.STATIC_ACCEL_PREFIX
+    )
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+
+def serve_sitemap(request, path):
+    """Отдаёт sitemap, собранный командой build_sitemaps."""
+    return serve_file(
+        request,
+        settings.SITEMAP_ROOT,
+        path,
+        f'public, max-age={settings.SITEMAP_CACHE_MAX_AGE}'
+    )
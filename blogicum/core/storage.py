@@ -0,0 +1,72 @@
+"""Хранилище статики с хэшами в именах и сжатыми копиями."""
+
+import gzip
+import posixpath
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = (
+    '.css', '.js', '.map', '.svg', '.txt', '.html', '.json', '.xml', '.ico'
+)
+MIN_COMPRESS_SIZE = 256
+
+
+def gzip_compress(content):
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def compressors():
+    """Расширения сжатых копий и функции сжатия."""
+    yield '.gz', gzip_compress
+    if brotli is not None:
+        yield '.br', brotli.compress
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage, дописывающий рядом .gz и .br.
+
+    Сжатые копии создаются только для текстовых файлов с хэшем в
+    имени и только если они меньше оригинала. Пока collectstatic не
+    запускался, {% static %} отдаёт исходные имена файлов.
+    """
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            if self.hashed_files:
+                raise
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Промежуточные имена CSS не нужны: сжимаются только итоговые.
+        for hashed_name in sorted(set(self.hashed_files.values())):
+            for compressed_name in self.compress(hashed_name):
+                yield hashed_name, compressed_name, True
+
+    def compress(self, name):
+        """Сохраняет сжатые копии файла; возвращает их имена."""
+        if posixpath.splitext(name)[1].lower() not in COMPRESSIBLE:
+            return
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        for extension, compress in compressors():
+            compressed = compress(content)
+            if len(compressed) >= len(content):
+                continue
+            compressed_name = name + extension
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed))
+            yield compressed_name
@@ -0,0 +1,135 @@
+"""Профилирование отрисовки шаблонов: время по шаблонам и тегам.
+
+Кадры — имена шаблонов (в том числе подключённых через include и
+extends), блоков и простых тегов вроде {% bootstrap_form %}. Результат
+выводится в формате collapsed stacks, который понимают flamegraph.pl,
+speedscope и inferno.
+"""
+
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from django.template.base import Template
+from django.template.loader_tags import BlockNode
+from django.template.library import InclusionNode, SimpleNode
+
+# Profile, в который пишется текущая отрисовка.
+current = ContextVar('template_profile', default=None)
+
+_lock = threading.Lock()
+
+
+class Profile:
+    """Число вызовов, полное и собственное время кадров и их стеки."""
+
+    def __init__(self):
+        self.stack = []
+        # Имя: [вызовы, полное время, собственное время].
+        self.stats = {}
+        # 'внешний;вложенный': собственное время.
+        self.stacks = Counter()
+
+    def enter(self, name):
+        # Кадр: имя, начало, время вложенных кадров.
+        self.stack.append([name, perf_counter(), 0.0])
+
+    def exit(self):
+        name, start, children = self.stack.pop()
+        elapsed = perf_counter() - start
+        if self.stack:
+            self.stack[-1][2] += elapsed
+        names = [frame[0] for frame in self.stack]
+        stats = self.stats.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        # Рекурсивный вызов уже входит в полное время внешнего.
+        if name not in names:
+            stats[1] += elapsed
+        stats[2] += elapsed - children
+        self.stacks[';'.join(names + [name])] += elapsed - children
+
+    def merge(self, other, root=None):
+        """Добавляет результаты other; root — общий корневой кадр стеков."""
+        for name, (calls, cumulative, own) in other.stats.items():
+            stats = self.stats.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += calls
+            stats[1] += cumulative
+            stats[2] += own
+        for stack, seconds in other.stacks.items():
+            self.stacks[f'{root};{stack}' if root else stack] += seconds
+
+    def collapsed(self):
+        """Строки «кадр;кадр;кадр микросекунды» для flamegraph."""
+        return ''.join(
+            f'{stack} {round(seconds * 1e6)}\n'
+            for stack, seconds in sorted(self.stacks.items())
+            if round(seconds * 1e6)
+        )
+
+
+# Стеки всех запросов процесса с корневым кадром — именем view.
+_profile = Profile()
+
+
+def timed(name):
+    """Декоратор метода отрисовки; name(self) — имя кадра."""
+    def decorator(render):
+        @wraps(render)
+        def wrapper(self, context):
+            profile = current.get()
+            if profile is None:
+                return render(self, context)
+            profile.enter(name(self))
+            try:
+                return render(self, context)
+            finally:
+                profile.exit()
+
+        wrapper.profiled = True
+        return wrapper
+    return decorator
+
+
+def instrument():
+    """Оборачивает отрисовку шаблонов и тегов; повторно ничего не делает.
+
+    Template._render вызывается и для include, и для родителя из
+    extends, поэтому base.html получает собственный кадр. Блоки
+    дочернего шаблона отрисовываются внутри родителя, поэтому у них
+    свои кадры {% block имя %}.
+    """
+    if getattr(Template._render, 'profiled', False):
+        return
+    Template._render = timed(
+        lambda template: template.name or '<string>'
+    )(Template._render)
+    for node in (SimpleNode, InclusionNode):
+        node.render = timed(
+            lambda node: f'{{% {node.func.__name__} %}}'
+        )(node.render)
+    BlockNode.render = timed(
+        lambda node: f'{{% block {node.name} %}}'
+    )(BlockNode.render)
+
+
+def record(profile, root):
+    """Добавляет профиль одного запроса в общий профиль процесса."""
+    with _lock:
+        _profile.merge(profile, root)
+
+
+def collected():
+    """Копия общего профиля процесса."""
+    profile = Profile()
+    with _lock:
+        profile.merge(_profile)
+    return profile
+
+
+def reset():
+    """Очищает общий профиль процесса."""
+    global _profile
+    with _lock:
+        _profile = Profile()
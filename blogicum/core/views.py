@@ -1,5 +1,12 @@
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import DatabaseError, connections
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import render
 
+from blogicum.backends.sqlite3.base import connection_metrics
+from core import metrics, template_profiler
+
 
 def page_not_found(
         request,
@@ -31,3 +38,37 @@ def internal_error(
         'pages/500.html',
         status=500
     )
+
+
+def db_health(
+        request
+):
+    try:
+        with connections['default'].cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except DatabaseError:
+        return JsonResponse({'status': 'error'}, status=503)
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        return JsonResponse({'status': 'ok'})
+    return JsonResponse({'status': 'ok', 'connections': connection_metrics()})
+
+
+def prometheus_metrics(
+        request
+):
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise PermissionDenied
+    return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+def template_profile(
+        request
+):
+    if not settings.TEMPLATE_PROFILING:
+        raise Http404
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise PermissionDenied
+    return HttpResponse(
+        template_profiler.collected().collapsed(),
+        content_type='text/plain; charset=utf-8'
+    )
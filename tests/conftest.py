@@ -32,6 +32,15 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    # Загрузки и копии изображений не попадают в MEDIA_ROOT проекта;
+    # очередь изображений разбирается в тестах явно, а не потоками,
+    # которые могли бы пережить тест.
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_JOBS_INLINE = False
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -84,6 +93,7 @@ pytest_plugins = [
     "fixtures.categories",
     "fixtures.comments",
     "adapters.comment",
+    "core.pytest_plugin",
 ]
 
 
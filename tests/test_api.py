@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+
+@pytest.fixture
+def api_posts(mixer: Mixer, user, published_category):
+    now = timezone.now()
+    return mixer.cycle(15).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=(now - timedelta(minutes=i) for i in range(15)),
+    )
+
+
+@pytest.mark.django_db
+def test_api_feed_pages_and_fields(api_posts, client):
+    response = client.get("/api/posts/", {"fields": "id,title"})
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data["results"][0]) == {"id", "title"}, (
+        "Убедитесь, что параметр fields ограничивает поля в ответе API."
+    )
+    ids = [post["id"] for post in data["results"]]
+    data = client.get(data["next"]).json()
+    ids += [post["id"] for post in data["results"]]
+    assert ids == [post.id for post in api_posts], (
+        "Убедитесь, что курсорная пагинация API выдаёт все посты по"
+        " порядку без пропусков."
+    )
+    assert set(data["results"][0]) == {"id", "title"}
+    assert client.get("/api/posts/", {"fields": "password"}).status_code == (
+        400
+    )
+
+
+@pytest.mark.django_db
+def test_api_conditional_get(api_posts, user_client, client):
+    for api_client in (client, user_client):
+        response = api_client.get("/api/posts/")
+        etag = response.headers.get("ETag")
+        assert etag and response.headers.get("Last-Modified"), (
+            "Убедитесь, что ответ API содержит ETag и Last-Modified."
+        )
+        response = api_client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            "Убедитесь, что API отвечает 304, если данные не изменились."
+        )
+    response = client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+    assert response.headers["X-Query-Count"] == "0", (
+        "Убедитесь, что анонимный условный запрос обслуживается из кэша"
+        " без обращений к базе."
+    )
+    api_posts[0].title = "Новый заголовок"
+    api_posts[0].save()
+    response = client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что после правки поста API возвращает новые данные."
+    )
+
+
+@pytest.mark.django_db
+def test_api_respects_visibility(api_posts, client, published_category):
+    hidden = api_posts[0]
+    hidden.is_published = False
+    hidden.save()
+    for url in (
+        "/api/posts/",
+        f"/api/category/{published_category.slug}/",
+        f"/api/profile/{hidden.author.username}/",
+    ):
+        ids = [post["id"] for post in client.get(url).json()["results"]]
+        assert hidden.id not in ids, (
+            "Убедитесь, что API не показывает снятые с публикации посты."
+        )
+
+
+@pytest.mark.django_db
+def test_api_post_without_category(api_posts, user_client, user):
+    orphan = api_posts[0]
+    orphan.category = None
+    orphan.save()
+    response = user_client.get(f"/api/profile/{user.username}/")
+    assert response.status_code == 200, (
+        "Убедитесь, что API автора не падает на постах без категории."
+    )
+    categories = {
+        post["id"]: post["category"] for post in response.json()["results"]
+    }
+    assert categories[orphan.id] is None, (
+        "Убедитесь, что у поста без категории API отдаёт category: null."
+    )
@@ -0,0 +1,39 @@
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(
+        mixer: Mixer, post_with_published_location, user_client
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Первый"})
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Второй"})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что добавление комментария увеличивает счётчик"
+        " `comment_count` публикации."
+    )
+    comment = post.comments.first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что удаление комментария уменьшает счётчик"
+        " `comment_count` публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_fixes_drift(
+        mixer: Mixer, post_with_published_location, user
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    type(post).objects.filter(pk=post.pk).update(comment_count=42)
+    call_command("recount_comments")
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что команда `recount_comments` восстанавливает"
+        " разошедшийся счётчик комментариев."
+    )
@@ -0,0 +1,45 @@
+import pytest
+from mixer.backend.django import Mixer
+
+
+@pytest.mark.django_db
+def test_comments_are_paginated(
+        mixer: Mixer, post_with_published_location, user, client
+):
+    post = post_with_published_location
+    mixer.cycle(25).blend("blog.Comment", post=post, author=user)
+    page = client.get(f"/posts/{post.id}/").context["comments"]
+    assert len(page) == 20 and page.has_next(), (
+        "Убедитесь, что на странице публикации выводится ограниченное число"
+        " комментариев и ссылка на следующие."
+    )
+    response = client.get(
+        f"/posts/{post.id}/comments/",
+        {"after": page.next_cursor, "format": "json"},
+    )
+    data = response.json()
+    assert len(data["comments"]) == 5 and data["next"] is None, (
+        "Убедитесь, что подгрузка комментариев возвращает оставшиеся"
+        " комментарии."
+    )
+    shown = {comment.id for comment in page}
+    shown.update(comment["id"] for comment in data["comments"])
+    assert shown == set(post.comments.values_list("id", flat=True))
+
+
+@pytest.mark.django_db
+def test_comment_formats_are_cached_separately(
+        mixer: Mixer, post_with_published_location, user, client
+):
+    post = post_with_published_location
+    mixer.cycle(25).blend("blog.Comment", post=post, author=user)
+    cursor = client.get(f"/posts/{post.id}/").context["comments"].next_cursor
+    url = f"/posts/{post.id}/comments/"
+    html = client.get(url, {"after": cursor})
+    assert html["Content-Type"].startswith("text/html")
+    response = client.get(url, {"after": cursor, "format": "json"})
+    assert response["Content-Type"] == "application/json", (
+        "Убедитесь, что HTML- и JSON-подгрузка комментариев кэшируются"
+        " под разными ключами."
+    )
+    assert len(response.json()["comments"]) == 5
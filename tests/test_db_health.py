@@ -0,0 +1,48 @@
+import pytest
+from django.db import OperationalError, connection, connections
+
+from blogicum.backends.sqlite3.base import connection_metrics
+
+
+@pytest.mark.django_db
+def test_db_health(client):
+    response = client.get("/health/db/")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok", (
+        "Убедитесь, что /health/db/ сообщает о доступности базы."
+    )
+    assert "reuse_rate" in response.json()["connections"]
+
+
+@pytest.mark.django_db
+def test_db_health_hides_metrics_from_other_clients(client, settings):
+    settings.METRICS_ALLOWED_IPS = ()
+    assert client.get("/health/db/").json() == {"status": "ok"}, (
+        "Убедитесь, что метрики соединений видны только с адресов"
+        " METRICS_ALLOWED_IPS."
+    )
+
+
+@pytest.mark.django_db
+def test_db_health_reports_unreachable_database(client, monkeypatch):
+    def unreachable():
+        raise OperationalError("unable to open database file")
+
+    monkeypatch.setattr(connections["default"], "cursor", unreachable)
+    response = client.get("/health/db/")
+    assert response.status_code == 503, (
+        "Убедитесь, что при недоступной базе /health/db/ отвечает 503."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_persistent_connection_reuse_is_counted():
+    connection.ensure_connection()
+    before = connection_metrics()["reused"]
+    # То же, что делает close_old_connections на границе запроса.
+    connection.close_if_unusable_or_obsolete()
+    connection.ensure_connection()
+    assert connection_metrics()["reused"] == before + 1, (
+        "Убедитесь, что повторное использование сохранённого соединения"
+        " учитывается в метриках."
+    )
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("suffix", ["", "atom/"])
+def test_feeds_list_published_posts(
+        suffix, post_with_published_location,
+        unpublished_posts_with_published_locations, client
+):
+    post = post_with_published_location
+    for url in (
+        f"/feed/{suffix}",
+        f"/category/{post.category.slug}/feed/{suffix}",
+        f"/profile/{post.author.username}/feed/{suffix}",
+    ):
+        response = client.get(url)
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert post.title in content, (
+            f"Убедитесь, что лента {url} содержит опубликованные посты."
+        )
+        for hidden in unpublished_posts_with_published_locations:
+            assert hidden.title not in content, (
+                f"Убедитесь, что лента {url} не содержит снятые с"
+                " публикации посты."
+            )
+
+
+@pytest.mark.django_db
+def test_feed_if_modified_since(post_with_published_location, client):
+    # Last-Modified точен до секунды: пост должен быть старше правки.
+    hour_ago = timezone.now() - timedelta(hours=1)
+    Post.objects.filter(pk=post_with_published_location.pk).update(
+        pub_date=hour_ago, updated_at=hour_ago
+    )
+    response = client.get("/feed/")
+    last_modified = response.headers["Last-Modified"]
+    response = client.get("/feed/", HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 304, (
+        "Убедитесь, что лента отвечает 304 на If-Modified-Since, если"
+        " посты не менялись."
+    )
+    post = post_with_published_location
+    post.title = "Свежий заголовок"
+    post.pub_date = timezone.now()
+    post.save()
+    response = client.get("/feed/", HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 200
+    assert "Свежий заголовок" in response.content.decode(), (
+        "Убедитесь, что лента перестраивается после изменения поста."
+    )
@@ -0,0 +1,267 @@
+import re
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image
+
+
+@pytest.mark.django_db
+def test_generate_renditions():
+    from blog.images import generate_renditions, rendition_name
+
+    buffer = BytesIO()
+    Image.new("RGB", (800, 400), color=(10, 20, 30)).save(buffer, "PNG")
+    name = default_storage.save(
+        "blogicum_images/rendition_test.png", ContentFile(buffer.getvalue())
+    )
+    try:
+        widths = generate_renditions(name)
+        assert widths == [320, 640], (
+            "Убедитесь, что уменьшенные копии создаются для каждой ширины,"
+            " но не шире оригинала."
+        )
+        for width in widths:
+            for extension in ("webp", "jpeg"):
+                rendition = rendition_name(name, width, extension)
+                with default_storage.open(rendition) as fh:
+                    assert Image.open(fh).width == width
+                default_storage.delete(rendition)
+    finally:
+        default_storage.delete(name)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_image_job_strips_exif_and_marks_post(
+        mixer, user, published_category
+):
+    from blog.jobs import run_pending_jobs
+
+    buffer = BytesIO()
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    Image.new("RGB", (400, 200)).save(buffer, "JPEG", exif=exif)
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=ContentFile(buffer.getvalue(), name="exif.jpg"),
+    )
+    post.refresh_from_db()
+    assert post.image_status == 1
+    original = post.image.name
+    assert run_pending_jobs() == 1
+    post.refresh_from_db()
+    try:
+        assert post.image_status == 2, (
+            "Убедитесь, что после обработки изображение поста помечается"
+            " готовым."
+        )
+        assert post.image.name != original
+        assert not default_storage.exists(original)
+        with default_storage.open(post.image.name) as fh:
+            cleaned = Image.open(fh)
+            assert not cleaned.getexif(), (
+                "Убедитесь, что из оригинала удаляются EXIF-данные."
+            )
+            assert cleaned.size == (200, 400), (
+                "Убедитесь, что поворот из EXIF применяется к изображению."
+            )
+    finally:
+        default_storage.delete(post.image.name)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stripped_image_keeps_storage_layout(
+        mixer, user, published_category
+):
+    from blog.jobs import run_pending_jobs
+
+    buffer = BytesIO()
+    Image.new("RGB", (30, 30)).save(buffer, "JPEG", exif=Image.Exif())
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=ContentFile(buffer.getvalue(), name="layout.jpg"),
+    )
+    assert run_pending_jobs() == 1
+    post.refresh_from_db()
+    assert re.fullmatch(
+        r"blogicum_images/([0-9a-f]{2})/\1[0-9a-f]{62}\.jpg", post.image.name
+    ), (
+        "Убедитесь, что очищенное изображение сохраняется как"
+        " blogicum_images/<ab>/<хэш>.jpg, с одним уровнем хэша."
+    )
+    with post.image.storage.open(post.image.name) as fh:
+        cleaned = fh.read()
+    twin = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=ContentFile(cleaned, name="twin.jpg"),
+    )
+    assert twin.image.name == post.image.name, (
+        "Убедитесь, что загрузка тех же байтов совпадает с очищенным"
+        " изображением и хранится одним файлом."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_identical_uploads_share_one_file(
+        mixer, user, published_category
+):
+    buffer = BytesIO()
+    Image.new("RGB", (50, 50), color=(1, 2, 3)).save(buffer, "PNG")
+    first, second = (
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            image=ContentFile(buffer.getvalue(), name=f"{name}.png"),
+        )
+        for name in ("first", "second")
+    )
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые изображения хранятся одним файлом."
+    )
+    storage = first.image.storage
+    first.delete()
+    assert storage.exists(second.image.name), (
+        "Убедитесь, что файл не удаляется, пока на него ссылается другой пост."
+    )
+    second.delete()
+    assert not storage.exists(second.image.name), (
+        "Убедитесь, что файл удаляется вместе с последним ссылающимся постом."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stale_post_save_keeps_processed_image(
+        mixer, user, published_category
+):
+    from blog.jobs import run_pending_jobs
+    from blog.models import Post
+
+    buffer = BytesIO()
+    Image.new("RGB", (40, 40)).save(buffer, "JPEG", exif=Image.Exif())
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=ContentFile(buffer.getvalue(), name="stale.jpg"),
+    )
+    stale = Post.objects.get(pk=post.pk)
+    assert run_pending_jobs() == 1
+    stale.title = "Изменённый заголовок"
+    stale.save()
+    post.refresh_from_db()
+    try:
+        assert post.image_status == 2 and post.title == stale.title, (
+            "Убедитесь, что сохранение поста, прочитанного до окончания"
+            " обработки изображения, не откатывает результат обработки."
+        )
+        assert default_storage.exists(post.image.name)
+        assert not post.image_jobs.filter(status="pending").exists()
+    finally:
+        default_storage.delete(post.image.name)
+
+
+@pytest.mark.django_db
+def test_failed_image_job_is_retried_later(mixer, user):
+    from blog.jobs import claim_job, run_job
+    from blog.models import ImageJob
+
+    post = mixer.blend("blog.Post", author=user, image="")
+    job = ImageJob.objects.create(post=post, image_name="missing.jpg")
+    run_job(claim_job())
+    job.refresh_from_db()
+    assert job.status == "pending" and job.run_after > job.created_at, (
+        "Убедитесь, что неудачное задание откладывается перед повтором."
+    )
+    assert claim_job() is None, (
+        "Убедитесь, что отложенное задание не берётся сразу же."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_released_file_kept_for_concurrent_identical_upload(
+        mixer, user, published_category
+):
+    from django.db import transaction
+
+    buffer = BytesIO()
+    Image.new("RGB", (50, 50), color=(4, 5, 6)).save(buffer, "PNG")
+    first = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=ContentFile(buffer.getvalue(), name="first.png"),
+    )
+    storage = first.image.storage
+    with transaction.atomic():
+        first.delete()
+        second = mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            image=ContentFile(buffer.getvalue(), name="second.png"),
+        )
+    assert storage.exists(second.image.name), (
+        "Убедитесь, что файл не удаляется, если до удаления на него"
+        " сослался новый пост с таким же изображением."
+    )
+    second.delete()
+    assert not storage.exists(second.image.name)
+
+
+@pytest.mark.django_db
+def test_stale_processing_job_is_reclaimed(mixer, user, settings):
+    from blog.jobs import claim_job, run_pending_jobs
+    from blog.models import ImageJob
+
+    post = mixer.blend("blog.Post", author=user, image="")
+    job = ImageJob.objects.create(post=post, image_name="missing.jpg")
+    assert claim_job().pk == job.pk
+    ImageJob.objects.filter(pk=job.pk).update(
+        updated_at=job.updated_at - timezone.timedelta(
+            seconds=settings.IMAGE_JOB_STALE_AFTER + 1
+        )
+    )
+    run_pending_jobs()
+    job.refresh_from_db()
+    assert job.attempts == 2, (
+        "Убедитесь, что задание, брошенное упавшим обработчиком,"
+        " снова берётся в работу."
+    )
+
+
+@pytest.mark.django_db
+def test_inline_failed_job_is_rescheduled(
+        mixer, user, settings, monkeypatch
+):
+    from blog import jobs
+    from blog.models import ImageJob
+
+    settings.IMAGE_JOBS_INLINE = True
+    scheduled = []
+    monkeypatch.setattr(jobs, "schedule_pending_jobs", scheduled.append)
+    post = mixer.blend("blog.Post", author=user, image="")
+    ImageJob.objects.create(post=post, image_name="missing.jpg")
+    jobs.run_job(jobs.claim_job())
+    assert scheduled == [settings.IMAGE_JOB_RETRY_DELAY], (
+        "Убедитесь, что без process_image_jobs неудачное задание"
+        " перезапускается после паузы."
+    )
+
+
+@pytest.mark.django_db
+def test_renditions_use_image_field_storage(
+        mixer, user, published_category, monkeypatch
+):
+    from blog import jobs
+    from blog.models import Post
+
+    buffer = BytesIO()
+    Image.new("RGB", (40, 40)).save(buffer, "PNG")
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=ContentFile(buffer.getvalue(), name="storage.png"),
+    )
+    storages = []
+    monkeypatch.setattr(
+        jobs, "save_renditions",
+        lambda name, image, storage: storages.append(storage) or [40],
+    )
+    jobs.run_job(jobs.claim_job())
+    assert storages == [Post._meta.get_field("image").storage], (
+        "Убедитесь, что копии сохраняются в хранилище поля image."
+    )
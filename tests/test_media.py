@@ -0,0 +1,61 @@
+import pytest
+
+
+@pytest.fixture
+def media_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / "notes.txt").write_bytes(b"0123456789")
+    return "/media/notes.txt"
+
+
+def read(response):
+    return b"".join(response.streaming_content)
+
+
+@pytest.mark.django_db
+def test_media_etag_and_not_modified(media_file, client):
+    response = client.get(media_file)
+    assert response.status_code == 200
+    assert read(response) == b"0123456789"
+    etag = response.headers.get("ETag")
+    assert etag and response.headers.get("Last-Modified"), (
+        "Убедитесь, что медиафайлы отдаются с заголовками ETag и"
+        " Last-Modified."
+    )
+    response = client.get(media_file, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что при совпадении If-None-Match возвращается 304."
+    )
+
+
+@pytest.mark.django_db
+def test_media_range(media_file, client):
+    response = client.get(media_file, HTTP_RANGE="bytes=2-5")
+    assert response.status_code == 206
+    assert read(response) == b"2345", (
+        "Убедитесь, что по заголовку Range отдаётся только запрошенный"
+        " диапазон."
+    )
+    assert response.headers["Content-Range"] == "bytes 2-5/10"
+    response = client.get(media_file, HTTP_RANGE="bytes=-3")
+    assert read(response) == b"789"
+    response = client.get(media_file, HTTP_RANGE="bytes=20-")
+    assert response.status_code == 416
+
+
+@pytest.mark.django_db
+def test_media_accel_redirect(media_file, client, settings):
+    settings.SENDFILE_BACKEND = "x-accel-redirect"
+    response = client.get(media_file)
+    assert response.headers.get("X-Accel-Redirect") == (
+        "/protected-media/notes.txt"
+    ), (
+        "Убедитесь, что отдачу файла можно передать прокси-серверу через"
+        " X-Accel-Redirect."
+    )
+    assert not response.content
+
+
+@pytest.mark.django_db
+def test_media_path_traversal(media_file, client):
+    assert client.get("/media/../settings.py").status_code == 404
@@ -0,0 +1,60 @@
+import pytest
+
+from core import metrics
+
+
+@pytest.fixture
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.mark.django_db
+def test_view_metrics_are_exported(
+    client, clean_metrics, post_with_published_location
+):
+    post = post_with_published_location
+    client.get(f"/posts/{post.id}/")
+    response = client.get("/metrics/")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    content = response.content.decode()
+    for metric in metrics.METRICS:
+        assert (
+            f'{metric}_count{{view="blog:post_detail"}} 1' in content
+        ), (
+            f"Убедитесь, что метрика {metric} записывается для каждого view."
+        )
+    sums = dict(
+        line.rsplit(" ", 1) for line in content.splitlines()
+        if '_sum{view="blog:post_detail"}' in line
+    )
+    queries = sums['blogicum_view_queries_sum{view="blog:post_detail"}']
+    assert float(queries), (
+        "Убедитесь, что SQL-запросы view учитываются в метриках."
+    )
+    assert float(
+        sums['blogicum_view_template_seconds_sum{view="blog:post_detail"}']
+    ), "Убедитесь, что время отрисовки шаблонов учитывается в метриках."
+
+
+def test_histogram_buckets_are_cumulative(clean_metrics):
+    metrics.observe(metrics.UNRESOLVED, {"blogicum_view_queries": 2})
+    metrics.observe(metrics.UNRESOLVED, {"blogicum_view_queries": 200})
+    content = metrics.render()
+    assert (
+        'blogicum_view_queries_bucket{view="unresolved",le="1"} 0' in content
+        and 'blogicum_view_queries_bucket{view="unresolved",le="2"} 1'
+        in content
+        and 'blogicum_view_queries_bucket{view="unresolved",le="+Inf"} 2'
+        in content
+        and 'blogicum_view_queries_sum{view="unresolved"} 202' in content
+    ), "Убедитесь, что корзины гистограммы накопительные, как в Prometheus."
+
+
+def test_metrics_endpoint_is_restricted(client, settings):
+    settings.METRICS_ALLOWED_IPS = ()
+    assert client.get("/metrics/").status_code == 403, (
+        "Убедитесь, что /metrics/ недоступна с посторонних адресов."
+    )
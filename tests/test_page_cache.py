@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+
+@pytest.mark.django_db
+def test_anonymous_page_cache_invalidation(
+        mixer: Mixer, user, published_category, unlogged_client
+):
+    first = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, title="Первая публикация"
+    )
+    unlogged_client.get("/")
+    unlogged_client.get(f"/posts/{first.id}/")
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, title="Вторая публикация"
+    )
+    assert "Вторая публикация" in unlogged_client.get("/").content.decode(), (
+        "Убедитесь, что кэш главной страницы сбрасывается при добавлении"
+        " публикации."
+    )
+    mixer.blend("blog.Comment", post=first, author=user, text="Свежий отзыв")
+    content = unlogged_client.get(f"/posts/{first.id}/").content.decode()
+    assert "Свежий отзыв" in content, (
+        "Убедитесь, что кэш страницы публикации сбрасывается при добавлении"
+        " комментария."
+    )
+
+
+@pytest.mark.django_db
+def test_page_cache_timeout_respects_scheduled_posts(
+        mixer: Mixer, user, published_category
+):
+    from blog.caching import page_cache_timeout
+
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(seconds=30)
+    )
+    assert 0 < page_cache_timeout() <= 30, (
+        "Убедитесь, что закэшированная страница живёт не дольше, чем до"
+        " ближайшей отложенной публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_publication_boundary_follows_new_posts(
+        mixer: Mixer, user, published_category
+):
+    from blog.publication import next_publication_boundary
+
+    later = timezone.now() + timedelta(hours=2)
+    sooner = timezone.now() + timedelta(hours=1)
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=later
+    )
+    assert next_publication_boundary() == later
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=sooner
+    )
+    assert next_publication_boundary() == sooner, (
+        "Убедитесь, что граница публикации пересчитывается после добавления"
+        " более ранней отложенной публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_count_survives_comments(
+        mixer: Mixer, user, published_category
+):
+    from blog.caching import feed_count_options
+
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True
+    )
+    key = feed_count_options("feed")["count_key"]
+    mixer.blend("blog.Comment", post=post, author=user)
+    assert feed_count_options("feed")["count_key"] == key, (
+        "Убедитесь, что комментарии не сбрасывают закэшированное число"
+        " постов ленты."
+    )
+    post.save()
+    assert feed_count_options("feed")["count_key"] != key, (
+        "Убедитесь, что запись поста сбрасывает закэшированное число постов."
+    )
@@ -0,0 +1,91 @@
+from datetime import timedelta
+
+import pytest
+from conftest import N_PER_PAGE
+from django.test import override_settings
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+
+@pytest.fixture
+def many_posts(mixer: Mixer, user, published_category):
+    now = timezone.now()
+    dates = (now - timedelta(minutes=i // 2) for i in range(25))
+    return mixer.cycle(25).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=dates,
+    )
+
+
+@pytest.mark.django_db
+@override_settings(INDEX_PAGINATION="cursor")
+def test_index_cursor_pagination(many_posts, client):
+    expected = sorted(
+        many_posts, key=lambda post: (post.pub_date, post.id), reverse=True
+    )
+    seen = []
+    url = "/"
+    pages = []
+    while url:
+        response = client.get(url)
+        page_obj = response.context["page_obj"]
+        assert len(page_obj) <= N_PER_PAGE, (
+            "Убедитесь, что курсорная страница содержит не больше"
+            f" {N_PER_PAGE} публикаций."
+        )
+        pages.append(page_obj)
+        seen.extend(post.id for post in page_obj)
+        url = (
+            f"/?after={page_obj.next_cursor}" if page_obj.has_next() else None
+        )
+    assert seen == [post.id for post in expected], (
+        "Убедитесь, что курсорная пагинация главной страницы выдаёт все"
+        " публикации по порядку без пропусков и повторов."
+    )
+    last_page = pages[-1]
+    response = client.get(f"/?before={last_page.previous_cursor}")
+    assert [post.id for post in response.context["page_obj"]] == [
+        post.id for post in pages[-2]
+    ], (
+        "Убедитесь, что ссылка на предыдущую курсорную страницу возвращает"
+        " предыдущую страницу."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(INDEX_PAGINATION="cursor")
+def test_index_cursor_pagination_bad_token(many_posts, client):
+    response = client.get("/?after=not-a-token")
+    assert response.status_code == 200
+    assert not response.context["page_obj"].has_previous(), (
+        "Убедитесь, что некорректный курсор открывает первую страницу."
+    )
+
+
+@pytest.mark.django_db
+def test_index_estimated_count_is_cached(
+        many_posts, mixer: Mixer, user_client
+):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get("/?page=2")
+    assert not any("COUNT(" in query["sql"] for query in queries), (
+        "Убедитесь, что число публикаций ленты берётся из кэша."
+    )
+    assert response.context["page_obj"].paginator.num_pages == 3
+    mixer.cycle(6).blend(
+        "blog.Post", author=many_posts[0].author,
+        category=many_posts[0].category, is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    response = user_client.get("/")
+    assert response.context["page_obj"].paginator.num_pages == 4, (
+        "Убедитесь, что закэшированное число публикаций обновляется при"
+        " добавлении публикации."
+    )
@@ -0,0 +1,23 @@
+import pytest
+
+
+@pytest.mark.django_db
+def test_post_card_cache_invalidation(post_with_published_location, client):
+    post = post_with_published_location
+    content = client.get("/").content.decode()
+    assert post.title in content
+
+    post.title = "Заголовок после правки"
+    post.save()
+    content = client.get("/").content.decode()
+    assert "Заголовок после правки" in content, (
+        "Убедитесь, что карточка поста перерисовывается после его правки."
+    )
+
+    post.category.title = "Новая категория"
+    post.category.save()
+    content = client.get("/").content.decode()
+    assert "Новая категория" in content, (
+        "Убедитесь, что карточки постов перерисовываются после изменения"
+        " категории."
+    )
@@ -0,0 +1,58 @@
+import pytest
+from django.test import override_settings
+
+
+@pytest.mark.django_db
+def test_query_budget_violation_is_reported(
+        post_with_published_location, user_client, query_budget_guard
+):
+    with override_settings(QUERY_BUDGETS={"blog:index": 0}):
+        response = user_client.get("/")
+    assert int(response["X-Query-Count"]) > 0
+    assert [report[0] for report in query_budget_guard] == ["blog:index"], (
+        "Убедитесь, что превышение бюджета запросов view попадает в отчёт"
+        " pytest-плагина."
+    )
+    query_budget_guard.clear()
+
+
+def test_query_shape_ignores_literals():
+    from core.middleware import query_shape
+
+    assert query_shape(
+        "SELECT * FROM t WHERE id IN (%s, %s, %s) AND a = 'x' LIMIT 21"
+    ) == query_shape("SELECT * FROM t WHERE id IN (%s) AND a = 'y' LIMIT 3")
+
+
+def count_queries(client, url):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_feed_queries_do_not_depend_on_page_size(
+        mixer, user, user_client, published_category, published_location
+):
+    urls = (
+        "/",
+        f"/category/{published_category.slug}/",
+        f"/profile/{user.username}/",
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, is_published=True
+    )
+    single = [count_queries(user_client, url) for url in urls]
+    mixer.cycle(9).blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, is_published=True
+    )
+    full = [count_queries(user_client, url) for url in urls]
+    assert single == full, (
+        "Убедитесь, что число запросов ленты не зависит от количества"
+        " публикаций на странице."
+    )
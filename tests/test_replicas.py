@@ -0,0 +1,82 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.urls import resolve
+
+from blog.caching import cache_anonymous_page
+from blog.models import Post
+from core.middleware import ReplicaMiddleware
+from core.routers import ReplicaRouter, use_replica
+
+
+@pytest.fixture
+def routed(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    router = ReplicaRouter()
+    chosen = []
+
+    def view(request):
+        chosen.append(router.db_for_read(Post))
+        return HttpResponse()
+
+    middleware = ReplicaMiddleware(view)
+
+    def request(rf, method, path, **cookies):
+        request = getattr(rf, method)(path)
+        request.COOKIES.update(cookies)
+        request.resolver_match = resolve(path)
+        middleware.process_view(request, view, (), {})
+        response = middleware(request)
+        return chosen.pop(), response
+
+    return request
+
+
+def test_replica_used_for_read_views(routed, rf):
+    assert routed(rf, "get", "/")[0] == "replica", (
+        "Убедитесь, что главная страница читает данные с реплики."
+    )
+    assert routed(rf, "get", "/posts/create/")[0] == "default", (
+        "Убедитесь, что view не из REPLICA_VIEWS читают с основной базы."
+    )
+    assert ReplicaRouter().db_for_read(Post) == "default", (
+        "Убедитесь, что вне запроса чтение идёт с основной базы."
+    )
+
+
+def test_reads_pinned_to_primary_after_write(routed, rf):
+    db, response = routed(rf, "post", "/posts/create/")
+    cookie = response.cookies[ReplicaMiddleware.pin_cookie]
+    assert cookie.value, (
+        "Убедитесь, что после записи клиент получает cookie, закрепляющую"
+        " его чтения за основной базой."
+    )
+    db, _ = routed(
+        rf, "get", "/", **{ReplicaMiddleware.pin_cookie: cookie.value}
+    )
+    assert db == "default", (
+        "Убедитесь, что сразу после записи клиент читает с основной базы."
+    )
+
+
+@pytest.mark.django_db
+def test_cached_pages_are_built_from_primary(settings, rf):
+    settings.DATABASE_REPLICAS = ["replica"]
+    chosen = []
+
+    @cache_anonymous_page("replica-test")
+    def view(request):
+        chosen.append(ReplicaRouter().db_for_read(Post))
+        return HttpResponse("page")
+
+    request = rf.get("/replica-test/")
+    request.user = AnonymousUser()
+    token = use_replica.set(True)
+    try:
+        view(request)
+    finally:
+        use_replica.reset(token)
+    assert chosen == ["default"], (
+        "Убедитесь, что страница, которая попадёт в общий кэш, строится"
+        " по основной базе, а не по отстающей реплике."
+    )
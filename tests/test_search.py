@@ -0,0 +1,102 @@
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+
+@pytest.fixture
+def searchable_posts(mixer: Mixer, user, published_category):
+    common = dict(
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() - timezone.timedelta(days=1),
+    )
+    return {
+        "visible": mixer.blend(
+            "blog.Post", title="Прогулка по лесу",
+            text="Осенний <b>лес</b> полон грибов.",
+            is_published=True, **common,
+        ),
+        "hidden": mixer.blend(
+            "blog.Post", title="Черновик про лес", text="Лес.",
+            is_published=False, **common,
+        ),
+        "other": mixer.blend(
+            "blog.Post", title="Море", text="Волны и песок.",
+            is_published=True, **common,
+        ),
+    }
+
+
+@pytest.mark.django_db
+def test_search_finds_visible_posts(searchable_posts, client):
+    response = client.get("/search/", {"q": "лес"})
+    assert response.status_code == 200
+    found = [post.id for post in response.context["page_obj"]]
+    assert found == [searchable_posts["visible"].id], (
+        "Убедитесь, что поиск находит опубликованные посты по словам"
+        " заголовка и текста и не показывает снятые с публикации."
+    )
+    content = response.content.decode()
+    assert "<mark>лес</mark>" in content, (
+        "Убедитесь, что найденные слова выделяются в результатах поиска."
+    )
+    assert "<b>" not in content, (
+        "Убедитесь, что HTML из текста поста экранируется во фрагментах."
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_follows_post_changes(searchable_posts, client):
+    post = searchable_posts["other"]
+    post.text = "Волны, песок и маяк."
+    post.save()
+    response = client.get("/search/", {"q": "маяк"})
+    assert [p.id for p in response.context["page_obj"]] == [post.id], (
+        "Убедитесь, что поисковый индекс обновляется при изменении поста."
+    )
+    post.delete()
+    response = client.get("/search/", {"q": "маяк"})
+    assert not list(response.context["page_obj"]), (
+        "Убедитесь, что удалённый пост пропадает из результатов поиска."
+    )
+
+
+@pytest.mark.django_db
+def test_search_ignores_fts_syntax(searchable_posts, client):
+    response = client.get("/search/", {"q": 'лес" OR NEAR(*'})
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_search_cap_counts_only_visible_posts(
+    searchable_posts, client, monkeypatch
+):
+    monkeypatch.setattr("blog.search.SEARCH_CANDIDATES", 1)
+    visible = searchable_posts["visible"]
+    hidden = searchable_posts["hidden"]
+    hidden.text = "Лес и опушка."
+    hidden.id = None
+    hidden.save()
+    response = client.get("/search/", {"q": "лес"})
+    assert [post.id for post in response.context["page_obj"]] == [
+        visible.id
+    ], (
+        "Убедитесь, что снятые с публикации посты не занимают места"
+        " среди ранжируемых кандидатов поиска."
+    )
+    assert not response.context["truncated"], (
+        "Убедитесь, что поиск не сообщает об отброшенных результатах,"
+        " если все видимые совпадения показаны."
+    )
+    older = searchable_posts["other"]
+    older.text = "Лес у моря."
+    older.save()
+    visible.text = "Лес у дороги."
+    visible.save()
+    response = client.get("/search/", {"q": "лес"})
+    assert response.context["truncated"], (
+        "Убедитесь, что поиск сообщает, когда часть совпадений отброшена."
+    )
+    assert "Уточните запрос" in response.content.decode(), (
+        "Убедитесь, что об отброшенных результатах сказано на странице."
+    )
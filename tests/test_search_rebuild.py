@@ -0,0 +1,64 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+
+def indexed_ids():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT rowid FROM blog_post_fts ORDER BY rowid")
+        return [row[0] for row in cursor.fetchall()]
+
+
+@pytest.fixture
+def unindexed_posts(mixer: Mixer, user, published_category):
+    posts = mixer.cycle(5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timezone.timedelta(days=1),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM blog_post_fts")
+        cursor.execute("INSERT INTO blog_post_fts (rowid) VALUES (999999)")
+    return posts
+
+
+@pytest.mark.django_db
+def test_rebuild_search_index(unindexed_posts):
+    output = StringIO()
+    call_command("rebuild_search_index", batch_size=2, stdout=output)
+    assert "строк/с" in output.getvalue().splitlines()[0], (
+        "Убедитесь, что прогресс пересборки выводится через self.stdout."
+    )
+    assert indexed_ids() == sorted(post.id for post in unindexed_posts), (
+        "Убедитесь, что rebuild_search_index индексирует все посты и"
+        " убирает из индекса строки несуществующих постов."
+    )
+
+
+@pytest.mark.django_db
+def test_rebuild_search_index_resume(unindexed_posts):
+    ids = sorted(post.id for post in unindexed_posts)
+    call_command("rebuild_search_index", batch_size=2)
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM blog_post_fts WHERE rowid > %s", [ids[1]])
+        cursor.execute(
+            "UPDATE blog_post_fts_progress SET last_id = %s", [ids[1]]
+        )
+    output = StringIO()
+    call_command(
+        "rebuild_search_index", batch_size=2, resume=True, verbosity=0,
+        stdout=output
+    )
+    assert "до id" not in output.getvalue(), (
+        "Убедитесь, что с --verbosity 0 прогресс не выводится."
+    )
+    assert indexed_ids() == ids, (
+        "Убедитесь, что с --resume пересборка продолжается с последней"
+        " записанной пачки."
+    )
@@ -0,0 +1,49 @@
+import pytest
+from django.core.management import call_command
+
+from blog.sitemaps import SitemapWriter
+
+
+@pytest.mark.django_db
+def test_build_and_serve_sitemaps(
+        settings, tmp_path, post_with_published_location,
+        unpublished_posts_with_published_locations, client
+):
+    settings.SITEMAP_ROOT = tmp_path
+    post = post_with_published_location
+    call_command("build_sitemaps", base_url="https://blogicum.test")
+    index = client.get("/sitemap.xml")
+    assert index.status_code == 200
+    index = b"".join(index.streaming_content).decode()
+    assert "https://blogicum.test/sitemaps/posts-1.xml" in index, (
+        "Убедитесь, что sitemap.xml ссылается на файлы с адресами постов."
+    )
+    posts = b"".join(
+        client.get("/sitemaps/posts-1.xml").streaming_content
+    ).decode()
+    assert f"https://blogicum.test/posts/{post.id}/" in posts
+    assert "<lastmod>" in posts, (
+        "Убедитесь, что в sitemap указывается lastmod постов."
+    )
+    for hidden in unpublished_posts_with_published_locations:
+        assert f"/posts/{hidden.id}/" not in posts, (
+            "Убедитесь, что в sitemap нет снятых с публикации постов."
+        )
+    categories = b"".join(
+        client.get("/sitemaps/categories-1.xml").streaming_content
+    ).decode()
+    assert f"/category/{post.category.slug}/" in categories
+    profiles = b"".join(
+        client.get("/sitemaps/profiles-1.xml").streaming_content
+    ).decode()
+    assert f"/profile/{post.author.username}/" in profiles
+
+
+def test_sitemap_writer_splits_files(tmp_path):
+    writer = SitemapWriter(tmp_path, "posts", per_file=2)
+    for number in range(5):
+        writer.add(f"https://blogicum.test/posts/{number}/")
+    names = [name for name, _ in writer.close()]
+    assert names == ["posts-1.xml", "posts-2.xml", "posts-3.xml"], (
+        "Убедитесь, что адреса делятся на файлы по заданному размеру."
+    )
@@ -0,0 +1,21 @@
+import pytest
+from django.db import connection
+
+# Значения, которые PRAGMA возвращает для настроек из SQLITE_PRAGMAS.
+EXPECTED_PRAGMAS = {
+    "busy_timeout": 5000,
+    "synchronous": 1,
+    "temp_store": 2,
+    "cache_size": -64000,
+}
+
+
+@pytest.mark.django_db
+def test_sqlite_pragmas_applied():
+    with connection.cursor() as cursor:
+        for pragma, expected in EXPECTED_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma}")
+            assert cursor.fetchone()[0] == expected, (
+                f"Убедитесь, что PRAGMA {pragma} из SQLITE_PRAGMAS"
+                " выполняется при открытии соединения."
+            )
@@ -0,0 +1,43 @@
+import pytest
+from django.core.management import call_command
+from django.templatetags.static import static
+
+
+@pytest.fixture
+def collected_static(settings, tmp_path):
+    source = tmp_path / "source"
+    (source / "css").mkdir(parents=True)
+    (source / "css" / "site.css").write_text("body { color: black; }\n" * 50)
+    settings.STATICFILES_DIRS = [source]
+    settings.STATIC_ROOT = tmp_path / "root"
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return settings.STATIC_ROOT
+
+
+def test_collectstatic_hashes_and_compresses(collected_static):
+    url = static("css/site.css")
+    assert url != "/static/css/site.css", (
+        "Убедитесь, что {% static %} возвращает имя файла с хэшем"
+        " содержимого."
+    )
+    hashed_name = url[len("/static/"):]
+    assert (collected_static / "staticfiles.json").exists()
+    assert (collected_static / f"{hashed_name}.gz").exists(), (
+        "Убедитесь, что collectstatic создаёт сжатые .gz-копии."
+    )
+
+
+@pytest.mark.django_db
+def test_hashed_static_is_immutable(collected_static, client):
+    url = static("css/site.css")
+    response = client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+    assert response.status_code == 200
+    assert "immutable" in response.headers["Cache-Control"], (
+        "Убедитесь, что файлы статики с хэшем в имени кэшируются навсегда."
+    )
+    assert response.headers.get("Content-Encoding") == "gzip", (
+        "Убедитесь, что клиенту, принимающему gzip, отдаётся сжатая копия."
+    )
+    response = client.get("/static/css/site.css")
+    assert "immutable" not in response.headers["Cache-Control"]
+    assert "Content-Encoding" not in response.headers
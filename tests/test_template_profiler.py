@@ -0,0 +1,81 @@
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from core import template_profiler
+
+
+@pytest.fixture
+def profiling(settings):
+    settings.TEMPLATE_PROFILING = True
+    template_profiler.reset()
+    yield
+    template_profiler.reset()
+
+
+@pytest.mark.django_db
+def test_template_profile_is_collapsed_by_view(
+    client, profiling, post_with_published_location
+):
+    client.get(f"/posts/{post_with_published_location.id}/")
+    response = client.get("/metrics/templates/")
+    assert response.status_code == 200
+    stacks = dict(
+        line.rsplit(" ", 1) for line in response.content.decode().splitlines()
+    )
+    assert all(value.isdigit() for value in stacks.values()), (
+        "Убедитесь, что профиль выводится в формате collapsed stacks."
+    )
+    assert any(
+        stack.startswith("blog:post_detail;blog/detail.html;base.html;")
+        and stack.endswith(";includes/comments.html")
+        for stack in stacks
+    ), (
+        "Убедитесь, что в стеках есть view, шаблон, родитель из extends"
+        " и шаблоны из include."
+    )
+
+
+def test_profile_self_and_cumulative_time():
+    profile = template_profiler.Profile()
+    profile.enter("base.html")
+    profile.enter("includes/header.html")
+    profile.exit()
+    profile.enter("includes/header.html")
+    profile.exit()
+    profile.exit()
+    base_calls, base_total, base_own = profile.stats["base.html"]
+    header_calls, header_total, header_own = profile.stats[
+        "includes/header.html"
+    ]
+    assert (base_calls, header_calls) == (1, 2)
+    assert base_own == pytest.approx(base_total - header_total), (
+        "Убедитесь, что собственное время шаблона не включает вложенные."
+    )
+    assert profile.stacks["base.html;includes/header.html"] == header_own
+
+
+def test_template_profile_disabled_by_default(client):
+    assert client.get("/metrics/templates/").status_code == 404, (
+        "Убедитесь, что профилирование шаблонов по умолчанию выключено."
+    )
+
+
+@pytest.mark.django_db
+def test_profile_templates_command_restores_settings(
+    post_with_published_location
+):
+    output = StringIO()
+    call_command(
+        "profile_templates", f"/posts/{post_with_published_location.id}/",
+        requests=1, clear_cache=True, stdout=output,
+    )
+    assert "blog/detail.html" in output.getvalue(), (
+        "Убедитесь, что команда profile_templates печатает время шаблонов."
+    )
+    assert not settings.TEMPLATE_PROFILING, (
+        "Убедитесь, что profile_templates не оставляет профилирование"
+        " включённым после работы."
+    )